@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.models import Group
 from django.utils.safestring import mark_safe
 
-from .models import Category, Comment, Location, Post
+from .models import AuthorStats, Category, Comment, Location, Post
 
 admin.site.unregister(Group)
 
@@ -40,6 +40,7 @@ class PostAdmin(admin.ModelAdmin):
         + common_list
         + ('image_tag',)
         + ('get_comment_count',)
+        + ('view_count',)
     )
     list_editable = common_list
 
@@ -83,3 +84,14 @@ class CommentAdmin(admin.ModelAdmin):
         'author'
     )
     list_display = ('__str__', ) + common_list
+
+
+@admin.register(AuthorStats)
+class AuthorStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        '__str__',
+        'post_count',
+        'comment_count',
+        'last_activity_at',
+    )
+    list_select_related = ('user',)
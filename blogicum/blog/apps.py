@@ -5,3 +5,15 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from django.conf import settings
+
+        from . import signals  # noqa: F401
+        from .lazyload import install_lazy_load_detector
+        from .profiling import install_template_profiler
+
+        if settings.LAZY_LOAD_DETECTION:
+            install_lazy_load_detector()
+        if settings.TEMPLATE_PROFILING:
+            install_template_profiler()
@@ -0,0 +1,244 @@
+import hashlib
+import math
+import random
+import time
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from core.constants import (CACHE_EARLY_EXPIRY_BETA, CACHE_LOCK_POLL_INTERVAL,
+                            CACHE_LOCK_TIMEOUT, CACHE_LOCK_WAIT,
+                            CACHE_STALE_TIMEOUT, NEGATIVE_CACHE_TIMEOUT)
+
+GLOBAL_FEED = 'all'
+"""Поколение, общее для всех лент (категории, локации, пользователи)."""
+
+
+def is_shared_cache(alias=DEFAULT_CACHE_ALIAS):
+    """
+    Кеш общий для всех процессов. LocMem хранит данные в памяти
+    процесса, поэтому поколения, изменённые отдельной командой или
+    другим воркером, в нём не видны.
+    """
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
+
+
+def _generation_key(feed):
+    return f'feed-generation:{feed}'
+
+
+def get_generations(*names):
+    """
+    Получение текущих поколений наборов данных одним запросом к кешу.
+    Отсутствующее поколение инициализируется текущим временем, чтобы
+    после очистки кеша ключи не совпали со старыми.
+    """
+    keys = [_generation_key(name) for name in names]
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), None)
+        generations.update(cache.get_many(missing))
+    return [generations.get(key, 0) for key in keys]
+
+
+def get_feed_generations(*feeds):
+    """Поколения лент вместе с общим поколением GLOBAL_FEED."""
+    return get_generations(GLOBAL_FEED, *feeds)
+
+
+def bump_generations(*names):
+    """
+    Инвалидация наборов данных (лент, справочников): закешированные
+    по старому поколению данные перестают совпадать.
+    """
+    for name in set(names):
+        key = _generation_key(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def feed_cache_key(feed, *parts):
+    """
+    Постоянный ключ фрагмента ленты. Поколение в ключ не входит и
+    хранится вместе со значением, чтобы после инвалидации можно было
+    отдать устаревший фрагмент, пока он пересчитывается.
+    """
+    return ':'.join(str(part) for part in (feed, *parts))
+
+
+def feed_generation(feed):
+    """Текущее поколение ленты вместе с общим поколением одной строкой."""
+    return ':'.join(str(part) for part in get_feed_generations(feed))
+
+
+def _expires_early(expires_at, delta):
+    """
+    Вероятностный досрочный пересчёт (XFetch): чем ближе срок истечения
+    и чем дольше вычисляется значение, тем выше вероятность пересчёта.
+    """
+    return (
+        time.time() - delta * CACHE_EARLY_EXPIRY_BETA
+        * math.log(1 - random.random())
+        >= expires_at
+    )
+
+
+def _is_fresh(entry, generation):
+    """Значение из кеша актуально и не выбрано для досрочного пересчёта."""
+    _, entry_generation, expires_at, delta = entry
+    return (
+        entry_generation == generation
+        and not _expires_early(expires_at, delta)
+    )
+
+
+def _store(key, value, timeout, generation, delta):
+    cache.set(
+        key,
+        (value, generation, time.time() + timeout, delta),
+        timeout + CACHE_STALE_TIMEOUT
+    )
+
+
+def _recompute(key, compute, timeout, generation):
+    started = time.monotonic()
+    value = compute()
+    _store(key, value, timeout, generation, time.monotonic() - started)
+    return value
+
+
+def get_or_recompute(key, compute, timeout, generation=None):
+    """
+    Получение значения из кеша с защитой от одновременного пересчёта.
+    Значение хранится вместе с поколением и сроком истечения. Если оно
+    устарело (истекло, сменилось поколение или сработал досрочный
+    пересчёт), то пересчитывает его только процесс, получивший
+    блокировку, а остальные отдают устаревшее значение. Если значения
+    нет совсем, то остальные ждут результата не дольше CACHE_LOCK_WAIT.
+    """
+    entry = cache.get(key)
+    if entry is not None and _is_fresh(entry, generation):
+        return entry[0]
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, True, CACHE_LOCK_TIMEOUT):
+        try:
+            return _recompute(key, compute, timeout, generation)
+        finally:
+            cache.delete(lock_key)
+    if entry is not None:
+        return entry[0]
+    deadline = time.monotonic() + CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(CACHE_LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+    return compute()
+
+
+def stream_or_recompute(key, render_chunks, timeout, generation=None):
+    """
+    Потоковый вариант get_or_recompute для строк: актуальное или
+    устаревшее (при чужом пересчёте) значение отдаётся одной частью,
+    а при пересчёте части отдаются по мере вычисления и сохраняются
+    в кеш целиком после последней. Если значения нет, а пересчёт
+    идёт в другом процессе, то ожидания нет: части вычисляются
+    без сохранения, чтобы не задерживать первый байт ответа.
+    """
+    entry = cache.get(key)
+    if entry is not None and _is_fresh(entry, generation):
+        yield entry[0]
+        return
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, True, CACHE_LOCK_TIMEOUT):
+        try:
+            started = time.monotonic()
+            parts = []
+            for chunk in render_chunks():
+                parts.append(chunk)
+                yield chunk
+            _store(
+                key,
+                ''.join(parts),
+                timeout,
+                generation,
+                time.monotonic() - started
+            )
+        finally:
+            cache.delete(lock_key)
+        return
+    if entry is not None:
+        yield entry[0]
+        return
+    yield from render_chunks()
+
+
+def post_feeds(post):
+    """
+    Ленты, в которых отображается пост.
+    Принимает объект с полями category_id и author_id, чтобы
+    не загружать связанные объекты.
+    """
+    return (
+        'index',
+        f'category:{post.category_id}',
+        f'profile:{post.author_id}',
+    )
+
+
+def _user_version_key(user_id):
+    return f'auth-user-version:{user_id}'
+
+
+def user_cache_key(user_id):
+    """
+    Ключ закешированного пользователя: id и версия.
+    Смена версии делает недействительными все копии пользователя.
+    """
+    version_key = _user_version_key(user_id)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key, 0)
+    return f'auth-user:{user_id}:{version}'
+
+
+def invalidate_cached_user(user_id):
+    """Сброс закешированного пользователя сменой его версии."""
+    version_key = _user_version_key(user_id)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, time.time_ns(), None)
+
+
+def _missing_key(name, lookup):
+    """
+    Ключ отсутствующего объекта. Значения из URL хешируются, чтобы
+    произвольный ввод не нарушал формат ключа кеша.
+    """
+    digest = hashlib.md5(
+        repr(sorted(lookup.items())).encode()
+    ).hexdigest()
+    generation = get_generations(f'missing:{name}')[0]
+    return f'missing:{name}:{generation}:{digest}'
+
+
+def is_known_missing(name, **lookup):
+    """Проверка, что объект недавно не был найден в БД."""
+    return cache.get(_missing_key(name, lookup)) is not None
+
+
+def remember_missing(name, **lookup):
+    """Запоминание отсутствия объекта на NEGATIVE_CACHE_TIMEOUT."""
+    cache.set(_missing_key(name, lookup), True, NEGATIVE_CACHE_TIMEOUT)
+
+
+def forget_missing(name):
+    """Сброс всех запомненных отсутствий (например, при создании объекта)."""
+    bump_generations(f'missing:{name}')
@@ -0,0 +1,116 @@
+import secrets
+import struct
+import zlib
+
+from django.utils.crypto import get_random_string
+
+from core.constants import BREACH_PADDING_MAX
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def random_padding():
+    """Случайная строка случайной длины для маскировки размера ответа."""
+    return get_random_string(secrets.randbelow(BREACH_PADDING_MAX) + 1)
+
+
+class GzipEncoder:
+    """
+    Потоковое сжатие gzip. В заголовок gzip записывается случайное
+    имя файла случайной длины (как в GZipMiddleware новых версий
+    Django): содержимое не меняется, а размер ответа маскируется
+    от атаки BREACH.
+    """
+
+    encoding = 'gzip'
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        self._crc = 0
+        self._size = 0
+        self._header = (
+            b'\x1f\x8b\x08\x08'
+            + struct.pack('<I', 0)
+            + b'\x00\xff'
+            + random_padding().encode()
+            + b'\x00'
+        )
+
+    def compress(self, data):
+        """Сжатие части ответа с немедленной отправкой (Z_SYNC_FLUSH)."""
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        chunk = (
+            self._compressor.compress(data)
+            + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        )
+        header, self._header = self._header, b''
+        return header + chunk
+
+    def finish(self):
+        header, self._header = self._header, b''
+        return header + self._compressor.flush() + struct.pack(
+            '<II', self._crc, self._size & 0xffffffff
+        )
+
+
+class BrotliEncoder:
+    """
+    Потоковое сжатие brotli. В формате нет места для произвольных
+    данных, поэтому размер HTML маскируется комментарием случайной
+    длины в конце документа.
+    """
+
+    encoding = 'br'
+
+    def __init__(self, level, html=False):
+        self._compressor = brotli.Compressor(quality=level)
+        self._html = html
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        tail = b''
+        if self._html:
+            tail = self._compressor.process(
+                f'<!-- {random_padding()} -->'.encode()
+            )
+        return tail + self._compressor.finish()
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых q=0."""
+    encodings = set()
+    for part in header.split(','):
+        encoding, _, params = part.strip().partition(';')
+        params = params.replace(' ', '')
+        if params in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        encodings.add(encoding.strip().lower())
+    return encodings
+
+
+def get_encoder(encoding, level, content_type):
+    """Потоковый кодировщик; None, если кодировка недоступна."""
+    if encoding == 'gzip':
+        return GzipEncoder(level)
+    if encoding == 'br' and brotli is not None:
+        return BrotliEncoder(level, html=content_type.startswith('text/html'))
+    return None
+
+
+def compress_content(encoder, content):
+    return encoder.compress(content) + encoder.finish()
+
+
+def compress_sequence(encoder, sequence):
+    """Сжатие потокового ответа по частям, без сборки его в памяти."""
+    for data in sequence:
+        chunk = encoder.compress(data)
+        if chunk:
+            yield chunk
+    yield encoder.finish()
@@ -0,0 +1,101 @@
+"""
+Отложенная запись счётчиков просмотров постов.
+Просмотры копятся в памяти процесса и сбрасываются в БД пачкой
+в фоновом потоке по порогу или по времени, поэтому запрос на чтение
+поста не выполняет UPDATE. При аварийном завершении процесса
+теряется не больше одного буфера.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.db import connections, transaction
+from django.db.models import F
+
+from core.constants import (VIEW_COUNTER_FLUSH_INTERVAL,
+                            VIEW_COUNTER_FLUSH_THRESHOLD)
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_buffer = Counter()
+_pending = 0
+_last_flush = time.monotonic()
+_flushing = threading.Event()
+
+
+def record_view(post_id):
+    """Учёт просмотра поста в буфере процесса."""
+    global _pending
+    with _lock:
+        _buffer[post_id] += 1
+        _pending += 1
+        due = (
+            _pending >= VIEW_COUNTER_FLUSH_THRESHOLD
+            or time.monotonic() - _last_flush >= VIEW_COUNTER_FLUSH_INTERVAL
+        )
+    if due and not _flushing.is_set():
+        _flushing.set()
+        threading.Thread(target=_flush_in_background, daemon=True).start()
+
+
+def pending_views(post_id):
+    """Просмотры поста, ещё не записанные в БД этим процессом."""
+    with _lock:
+        return _buffer[post_id]
+
+
+def _take_buffer():
+    global _buffer, _pending, _last_flush
+    with _lock:
+        taken, _buffer = _buffer, Counter()
+        _pending = 0
+        _last_flush = time.monotonic()
+    return taken
+
+
+def flush_view_counts():
+    """
+    Запись накопленных просмотров в БД.
+    Посты с одинаковым приростом обновляются одним запросом.
+    Возвращает количество записанных просмотров. При ошибке просмотры
+    возвращаются в буфер до следующего сброса.
+    """
+    from .models import Post
+
+    taken = _take_buffer()
+    by_increment = defaultdict(list)
+    for post_id, increment in taken.items():
+        by_increment[increment].append(post_id)
+    try:
+        with transaction.atomic():
+            for increment, post_ids in by_increment.items():
+                Post.objects.filter(pk__in=post_ids).update(
+                    view_count=F('view_count') + increment
+                )
+    except Exception:
+        with _lock:
+            _buffer.update(taken)
+        raise
+    return sum(taken.values())
+
+
+def _flush_in_background():
+    try:
+        flush_view_counts()
+    finally:
+        connections.close_all()
+        _flushing.clear()
+
+
+@atexit.register
+def _flush_at_exit():
+    """Сброс буфера при штатной остановке процесса."""
+    if not _buffer:
+        return
+    try:
+        flush_view_counts()
+    except Exception:
+        logger.exception('Не удалось записать буфер просмотров')
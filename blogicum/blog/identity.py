@@ -0,0 +1,62 @@
+from django.core.exceptions import EmptyResultSet
+from django.http import Http404
+
+
+class IdentityMap:
+    """
+    Карта идентичности запроса: объект, загруженный по некоторому
+    QuerySet и условиям, повторно берётся из памяти, а не из БД.
+    Ключ учитывает SQL исходного QuerySet, поэтому дополнительные
+    фильтры (например, по автору) не обходятся.
+    """
+
+    def __init__(self):
+        self._objects = {}
+
+    @staticmethod
+    def _make_key(queryset, lookup):
+        try:
+            query = str(queryset.query)
+        except EmptyResultSet:
+            query = None
+        return (
+            queryset.model._meta.label,
+            query,
+            tuple(sorted(lookup.items())),
+        )
+
+    def get(self, queryset, **lookup):
+        """
+        Аналог queryset.get(**lookup) с запоминанием результата.
+        Отсутствие объекта тоже запоминается.
+        """
+        key = self._make_key(queryset, lookup)
+        if key not in self._objects:
+            try:
+                self._objects[key] = queryset.get(**lookup)
+            except queryset.model.DoesNotExist:
+                self._objects[key] = None
+        obj = self._objects[key]
+        if obj is None:
+            raise queryset.model.DoesNotExist(
+                f'{queryset.model._meta.object_name} matching query '
+                'does not exist.'
+            )
+        return obj
+
+    def get_object_or_404(self, queryset, **lookup):
+        """Аналог django.shortcuts.get_object_or_404 через карту."""
+        try:
+            return self.get(queryset, **lookup)
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                f'No {queryset.model._meta.object_name} matches the given '
+                'query.'
+            )
+
+
+def get_identity_map(request):
+    """Карта идентичности текущего запроса, создаётся при первом обращении."""
+    if not hasattr(request, '_identity_map'):
+        request._identity_map = IdentityMap()
+    return request._identity_map
@@ -0,0 +1,145 @@
+import atexit
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.http import Http404
+from PIL import Image, ImageOps
+
+from core.constants import (RESIZE_CACHE_MAX_BYTES, RESIZE_CACHE_SHARDS,
+                            RESIZE_SIZES, RESIZE_WORKERS)
+
+_lock = threading.Lock()
+_pool = None
+_pending = {}
+"""Уменьшения, выполняющиеся сейчас: ключ кеша -> Future."""
+
+
+def _get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=RESIZE_WORKERS)
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def resize_image(source, target, width, height):
+    """
+    Уменьшение изображения с сохранением пропорций (выполняется
+    в процессе пула). Файл записывается во временный и атомарно
+    переименовывается, поэтому читатели не увидят его частично.
+    """
+    with Image.open(source) as image:
+        image_format = image.format
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((width, height))
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target))
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                image.save(file, format=image_format)
+            os.replace(temp_path, target)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def get_source_path(name, root=None):
+    """
+    Путь к исходному файлу внутри root (по умолчанию MEDIA_ROOT).
+    Выход за пределы каталога и отсутствующие файлы дают 404.
+    """
+    root = Path(root or settings.MEDIA_ROOT).resolve()
+    source = (root / name).resolve()
+    if root not in source.parents or not source.is_file():
+        raise Http404()
+    return source
+
+
+def get_cache_key(source, width, height):
+    """
+    Ключ уменьшенной копии: путь, размер и время изменения исходника.
+    После замены исходного файла старые копии вытесняются по LRU.
+    """
+    stat = source.stat()
+    return hashlib.sha1(
+        f'{source}:{stat.st_mtime_ns}:{stat.st_size}:{width}x{height}'
+        .encode()
+    ).hexdigest()
+
+
+def get_cache_path(key, suffix):
+    shard = int(key[:8], 16) % RESIZE_CACHE_SHARDS
+    return Path(settings.RESIZE_CACHE_ROOT) / f'{shard:03x}' / (key + suffix)
+
+
+def evict_shard(shard_dir, max_bytes=None):
+    """
+    Удаление давно не запрашивавшихся файлов шарда, пока его размер
+    больше своей доли RESIZE_CACHE_MAX_BYTES. Время последнего
+    обращения хранится в mtime файла. Возвращает число удалённых.
+    """
+    if max_bytes is None:
+        max_bytes = RESIZE_CACHE_MAX_BYTES // RESIZE_CACHE_SHARDS
+    entries = []
+    total = 0
+    with os.scandir(shard_dir) as it:
+        for entry in it:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def get_resized_image(source, width, height, key=None):
+    """
+    Путь к уменьшенной копии исходного файла. Копия берётся
+    из дискового кеша или создаётся в пуле процессов, одновременные
+    запросы одной копии ждут одного уменьшения.
+    """
+    if (width, height) not in RESIZE_SIZES:
+        raise Http404()
+    key = key or get_cache_key(source, width, height)
+    target = get_cache_path(key, source.suffix.lower())
+    try:
+        os.utime(target)
+        return target
+    except FileNotFoundError:
+        pass
+    pool = _get_pool()
+    with _lock:
+        future = _pending.get(key)
+        if future is None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            future = pool.submit(
+                resize_image, str(source), str(target), width, height
+            )
+            _pending[key] = future
+    try:
+        future.result()
+    except (OSError, Image.DecompressionBombError):
+        raise Http404()
+    finally:
+        with _lock:
+            if _pending.get(key) is future:
+                del _pending[key]
+    evict_shard(target.parent)
+    return target
@@ -0,0 +1,131 @@
+import logging
+import sys
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models.fields.related_descriptors import \
+    ForwardManyToOneDescriptor
+from django.db.models.query import ModelIterable, QuerySet
+from django.db.models.query_utils import DeferredAttribute
+
+logger = logging.getLogger(__name__)
+
+_detecting = ContextVar('lazy_load_detection', default=False)
+
+_THIS_FILE = Path(__file__).resolve()
+
+
+class LazyLoadError(RuntimeError):
+    """Ленивая загрузка поля у объекта, полученного в составе выборки."""
+
+
+def _project_frame():
+    """Ближайший кадр стека из кода проекта: «файл:строка в функции»."""
+    root = Path(settings.BASE_DIR).resolve()
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = Path(frame.f_code.co_filename).resolve()
+        if path != _THIS_FILE and root in path.parents:
+            return (
+                f'{path.relative_to(root)}:{frame.f_lineno} '
+                f'в {frame.f_code.co_name}'
+            )
+        frame = frame.f_back
+    return None
+
+
+def _template_frame():
+    """Ближайший отрисовываемый тег или переменная: «шаблон:строка»."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            token = getattr(node, 'token', None)
+            origin = getattr(node, 'origin', None)
+            if token is not None and origin is not None:
+                name = origin.template_name or origin.name
+                return f'{name}:{token.lineno}'
+        frame = frame.f_back
+    return None
+
+
+def _report(instance, field_name):
+    origin = getattr(instance._state, 'batch_origin', None)
+    if origin is None:
+        return
+    message = (
+        f'Ленивая загрузка {type(instance).__name__}.{field_name} '
+        f'у объекта из выборки {origin}'
+    )
+    template = _template_frame()
+    if template:
+        message += f', шаблон {template}'
+    code = _project_frame()
+    if code:
+        message += f', код {code}'
+    if settings.LAZY_LOAD_DETECTION == 'raise':
+        raise LazyLoadError(message)
+    logger.warning(message)
+
+
+def start_detection():
+    """Включение проверки в текущем контексте; возвращает токен."""
+    return _detecting.set(True)
+
+
+def stop_detection(token):
+    _detecting.reset(token)
+
+
+def install_lazy_load_detector():
+    """
+    Обёртки над загрузкой выборок, связей ForeignKey/OneToOne и
+    отложенных полей. Объекты из выборки больше чем в одну строку
+    помечаются местом, где выборка вычислена. Загрузка связи или
+    отложенного поля у такого объекта - это запрос на каждую строку,
+    о котором пишется в журнал или выбрасывается LazyLoadError
+    (LAZY_LOAD_DETECTION = 'log' или 'raise').
+    Без включённой проверки обёртки только читают переменную контекста.
+    """
+    if getattr(QuerySet._fetch_all, 'detecting', False):
+        return
+    fetch_all = QuerySet._fetch_all
+    get_object = ForwardManyToOneDescriptor.get_object
+    get_deferred = DeferredAttribute.__get__
+
+    def _fetch_all(self):
+        fetched = self._result_cache is None
+        fetch_all(self)
+        if (
+            not fetched
+            or not _detecting.get()
+            or not issubclass(self._iterable_class, ModelIterable)
+            or len(self._result_cache) < 2
+        ):
+            return
+        origin = (
+            f'{self.model.__name__} '
+            f'({_template_frame() or _project_frame() or "?"})'
+        )
+        for instance in self._result_cache:
+            instance._state.batch_origin = origin
+
+    def get_related_object(self, instance):
+        if _detecting.get():
+            _report(instance, self.field.name)
+        return get_object(self, instance)
+
+    def get_deferred_field(self, instance, cls=None):
+        if (
+            instance is not None
+            and _detecting.get()
+            and self.field.attname not in instance.__dict__
+        ):
+            _report(instance, self.field.attname)
+        return get_deferred(self, instance, cls)
+
+    _fetch_all.detecting = True
+    QuerySet._fetch_all = _fetch_all
+    ForwardManyToOneDescriptor.get_object = get_related_object
+    DeferredAttribute.__get__ = get_deferred_field
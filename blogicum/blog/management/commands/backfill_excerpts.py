@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from core.constants import EXCERPT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    """Заполнение анонсов постов, сохранённых до появления поля excerpt."""
+
+    help = 'Рассчитывает поле excerpt у постов пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересчитать анонсы всех постов, а не только пустые.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EXCERPT_BATCH_SIZE,
+            help='Количество постов в одном запросе.'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('pk').only('pk', 'text')
+        if not options['all']:
+            posts = posts.filter(excerpt='')
+        processed = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                posts.filter(pk__gt=last_pk)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for post in batch:
+                post.excerpt = Post.make_excerpt(post.text)
+            Post.objects.bulk_update(batch, ('excerpt',))
+            processed += len(batch)
+        self.stdout.write(
+            self.style.SUCCESS(f'Заполнено анонсов: {processed}')
+        )
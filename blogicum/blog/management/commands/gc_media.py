@@ -0,0 +1,135 @@
+import os
+import shutil
+import time
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from blog.models import Post
+from core.constants import MEDIA_GC_BATCH_SIZE, MEDIA_GC_GRACE_PERIOD
+
+
+def walk_files(directory):
+    """Обход дерева каталогов без построения полного списка файлов."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    """Удаление файлов изображений, на которые не ссылается ни один пост."""
+
+    help = (
+        'Обходит каталог изображений постов и удаляет (или переносит '
+        'в карантин) файлы без ссылок из БД старше периода ожидания.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace',
+            type=float,
+            default=MEDIA_GC_GRACE_PERIOD,
+            help='Минимальный возраст удаляемого файла в секундах.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=MEDIA_GC_BATCH_SIZE,
+            help='Количество файлов, проверяемых одним запросом.'
+        )
+        parser.add_argument(
+            '--quarantine',
+            help='Каталог, в который переносятся файлы вместо удаления.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, что было бы удалено.'
+        )
+
+    def find_orphans(self, root, grace, batch_size):
+        """
+        Потерянные файлы каталога изображений: (путь, имя, размер).
+        Ссылки проверяются пачками, поэтому в памяти не хранится
+        ни список всех файлов, ни список всех имён из БД.
+        После проверки ссылок время изменения читается заново:
+        повторная загрузка того же содержимого обновляет его, и файл
+        для ещё не сохранённого поста не удаляется.
+        """
+        media_root = Path(settings.MEDIA_ROOT)
+        deadline = time.time() - grace
+        old_files = (
+            entry for entry in walk_files(root)
+            if entry.stat().st_mtime < deadline
+        )
+        for batch in batched(old_files, batch_size):
+            names = {
+                Path(entry.path).relative_to(media_root).as_posix(): entry
+                for entry in batch
+            }
+            referenced = set(
+                Post.objects
+                .filter(image__in=names)
+                .values_list('image', flat=True)
+            )
+            for name, entry in names.items():
+                if name in referenced:
+                    continue
+                try:
+                    stat = os.stat(entry.path)
+                except FileNotFoundError:
+                    continue
+                if stat.st_mtime < deadline:
+                    yield entry.path, name, stat.st_size
+
+    def remove(self, path, name, quarantine):
+        if quarantine is None:
+            os.unlink(path)
+            return
+        target = Path(quarantine) / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(path, target)
+
+    def remove_empty_dirs(self, root):
+        """Удаление опустевших каталогов шардов (корень сохраняется)."""
+        for directory, _, _ in os.walk(root, topdown=False):
+            if directory != str(root):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass
+
+    def handle(self, *args, **options):
+        root = Path(settings.MEDIA_ROOT) / Post.image.field.upload_to
+        if not root.is_dir():
+            self.stdout.write(f'Каталог {root} не найден.')
+            return
+        count = reclaimed = 0
+        for path, name, size in self.find_orphans(
+            root, options['grace'], options['batch_size']
+        ):
+            if options['dry_run']:
+                self.stdout.write(f'{name} ({filesizeformat(size)})')
+            else:
+                self.remove(path, name, options['quarantine'])
+            count += 1
+            reclaimed += size
+        if not options['dry_run']:
+            self.remove_empty_dirs(root)
+        action = 'Будет освобождено' if options['dry_run'] else 'Освобождено'
+        self.stdout.write(
+            f'{action}: {filesizeformat(reclaimed)} ({reclaimed} байт), '
+            f'файлов: {count}'
+        )
@@ -0,0 +1,84 @@
+import os
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+from blog.storage import is_content_addressed
+from core.constants import IMAGE_MIGRATION_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    """Перенос изображений постов в контентно-адресуемое хранилище."""
+
+    help = (
+        'Переименовывает загруженные ранее изображения постов по хешу '
+        'содержимого пачками. Одинаковые файлы объединяются в один.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMAGE_MIGRATION_BATCH_SIZE,
+            help='Количество постов, обрабатываемых за одну транзакцию.'
+        )
+
+    def migrate_batch(self, posts):
+        """
+        Перенос изображений пачки постов. Новые имена создаются жёсткими
+        ссылками, а старые файлы удаляются только после фиксации
+        транзакции, поэтому при ошибке ничего не теряется.
+        Возвращает количество перенесённых постов.
+        """
+        old_names = set()
+        changed = []
+        for post in posts:
+            old_name = post.image.name
+            try:
+                path = default_storage.path(old_name)
+                post.image.name = default_storage.save_existing(
+                    path, old_name
+                )
+            except FileNotFoundError:
+                self.stderr.write(f'Файл не найден: {old_name}')
+                continue
+            old_names.add(old_name)
+            changed.append(post)
+        with transaction.atomic():
+            Post.objects.bulk_update(changed, ('image',))
+            transaction.on_commit(lambda: self.remove_old(old_names))
+        return len(changed)
+
+    def remove_old(self, names):
+        referenced = set(
+            Post.objects
+            .filter(image__in=names)
+            .values_list('image', flat=True)
+        )
+        for name in names - referenced:
+            try:
+                os.unlink(default_storage.path(name))
+            except FileNotFoundError:
+                pass
+
+    def handle(self, *args, **options):
+        posts = (
+            Post.objects
+            .exclude(image='')
+            .order_by('pk')
+            .only('pk', 'image')
+        )
+        migrated = 0
+        last_pk = 0
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            migrated += self.migrate_batch(
+                post for post in batch
+                if not is_content_addressed(post.image.name)
+            )
+        self.stdout.write(f'Перенесено изображений: {migrated}')
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog.caching import is_shared_cache
+from blog.publication import next_epoch, run_publication_tick
+from blog.warmup import warm_urls
+
+
+class Command(BaseCommand):
+    """Планировщик выпуска отложенных публикаций."""
+
+    help = (
+        'На каждой границе окна публикации инвалидирует ленты, в которых '
+        'появились отложенные посты, и прогревает их страницы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить один шаг и завершиться (например, из cron).'
+        )
+        parser.add_argument(
+            '--no-warm',
+            action='store_true',
+            help='Не прогревать страницы после инвалидации.'
+        )
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            raise CommandError(
+                'Кеш по умолчанию локален для процесса: смена поколений '
+                'лент не дойдёт до веб-воркеров. Задайте адрес общего '
+                'memcached в MEMCACHED_LOCATION.'
+            )
+        while True:
+            epoch, urls = run_publication_tick()
+            if urls and not options['no_warm']:
+                for url, status in warm_urls(urls).items():
+                    self.stdout.write(f'{status} {url}')
+            if options['once']:
+                return
+            delay = (next_epoch(epoch) - timezone.now()).total_seconds()
+            time.sleep(max(delay, 0))
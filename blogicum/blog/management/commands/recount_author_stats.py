@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from blog.stats import recount_author_stats
+from core.constants import STATS_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    """Сверка предрассчитанной статистики авторов с данными в БД."""
+
+    help = 'Пересчитывает статистику авторов по публикациям и комментариям.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=STATS_BATCH_SIZE,
+            help='Количество пользователей в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        processed = recount_author_stats(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано пользователей: {processed}')
+        )
@@ -0,0 +1,66 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.constants import SESSION_SWEEP_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    """Пакетное удаление истёкших сессий из django_session."""
+
+    help = (
+        'Удаляет истёкшие сессии небольшими пачками, чтобы не блокировать '
+        'таблицу надолго. С --interval работает как периодическая задача.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SESSION_SWEEP_BATCH_SIZE,
+            help='Количество сессий, удаляемых одним запросом.'
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.1,
+            help='Пауза между пачками в секундах.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Повторять очистку с этим интервалом в секундах.'
+        )
+
+    def sweep(self, batch_size, pause):
+        """Удаление истёкших сессий. Возвращает количество удалённых."""
+        now = timezone.now()
+        expired = (
+            Session.objects
+            .filter(expire_date__lt=now)
+            .values_list('session_key', flat=True)
+        )
+        deleted = 0
+        while True:
+            batch = list(expired[:batch_size])
+            if not batch:
+                return deleted
+            with transaction.atomic():
+                deleted += Session.objects.filter(
+                    session_key__in=batch
+                ).delete()[0]
+            if len(batch) < batch_size:
+                return deleted
+            time.sleep(pause)
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = self.sweep(options['batch_size'], options['pause'])
+            self.stdout.write(f'Удалено истёкших сессий: {deleted}')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.caching import is_shared_cache
+from blog.warmup import collect_warmup_urls, warm_machinery, warm_urls
+from core.constants import (WARMUP_PAGES, WARMUP_POSTS, WARMUP_PROFILES,
+                            WARMUP_WORKERS)
+
+
+class Command(BaseCommand):
+    """
+    Прогрев кешей после деплоя или перезапуска. Команда работает
+    в отдельном процессе, поэтому веб-воркерам полезен только прогрев
+    общего кеша (memcached из MEMCACHED_LOCATION). Кеш LocMem прогревается
+    внутри воркера при WARM_CACHES_ON_STARTUP.
+    """
+
+    help = (
+        'Загружает шаблоны и маршруты и запрашивает горячие страницы: '
+        'первые страницы главной, категории, недавно активные посты '
+        'и профили. Требует кеша, общего с веб-воркерами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages',
+            type=int,
+            default=WARMUP_PAGES,
+            help='Количество первых страниц главной ленты.'
+        )
+        parser.add_argument(
+            '--posts',
+            type=int,
+            default=WARMUP_POSTS,
+            help='Количество недавно активных постов.'
+        )
+        parser.add_argument(
+            '--profiles',
+            type=int,
+            default=WARMUP_PROFILES,
+            help='Количество недавно активных профилей.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=WARMUP_WORKERS,
+            help='Количество потоков, одновременно выполняющих запросы.'
+        )
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            self.stderr.write(
+                'Кеш по умолчанию локален для процесса: прогретые '
+                'страницы не попадут к веб-воркерам.'
+            )
+        started = time.perf_counter()
+        templates = warm_machinery()
+        self.stdout.write(f'Загружено шаблонов: {templates}')
+        urls = collect_warmup_urls(
+            options['pages'], options['posts'], options['profiles']
+        )
+        for url, status in warm_urls(urls, options['workers']).items():
+            self.stdout.write(f'{status} {url}')
+        self.stdout.write(
+            f'Прогрето страниц: {len(urls)} '
+            f'за {time.perf_counter() - started:.2f} с'
+        )
@@ -10,11 +10,14 @@ class PublishedPostManager(models.Manager):
         return (
             PostQuerySet(self.model)
             .with_actual_data()
-            .published()
-            .category_published()
+            .visible()
             .ordered_by_pub_date()
         )
 
     def with_comment_count(self):
         """Метод для получения числа комментариев для админ-панели"""
         return self.get_queryset().with_comment_count()
+
+    def for_feed(self):
+        """Метод для получения выборки карточек лент."""
+        return self.get_queryset().for_feed()
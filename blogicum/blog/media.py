@@ -0,0 +1,120 @@
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import parse_http_date_safe, quote_etag
+
+from core.constants import MEDIA_CHUNK_SIZE
+
+from .models import Post
+from .publication import publication_epoch
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def get_file_etag(stat):
+    """ETag файла по времени изменения и размеру, без чтения содержимого."""
+    return quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+
+
+def get_media_access(name, user):
+    """
+    Доступ к файлу изображения: 'public', если он принадлежит
+    опубликованному посту, 'private', если только неопубликованному
+    посту текущего пользователя, и None, если доступа нет.
+    """
+    posts = Post.objects.filter(image=name)
+    if posts.filter(
+        is_visible=True, pub_date__lte=publication_epoch()
+    ).exists():
+        return 'public'
+    if user.is_authenticated and posts.filter(author=user).exists():
+        return 'private'
+    return None
+
+
+def parse_range(header, size):
+    """
+    Разбор заголовка Range с одним диапазоном.
+    Возвращает (начало, конец включительно), None, если заголовок
+    не поддерживается и нужно отдать весь файл, или False, если
+    диапазон за пределами файла.
+    """
+    match = RANGE_RE.match(header.strip())
+    if match is None or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if start == '':
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = size - 1 if end == '' else min(int(end), size - 1)
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def if_range_passes(request, etag, last_modified):
+    """Проверка If-Range: диапазон отдаётся, только если файл не менялся."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range is None:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _read_range(file, start, length):
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(MEDIA_CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def sendfile_response(path, name, content_type):
+    """
+    Пустой ответ с заголовком для фронт-сервера, который сам отдаёт
+    файл (и обрабатывает Range), не занимая процесс Django.
+    """
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_SENDFILE == 'nginx':
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_SENDFILE_PREFIX + quote(name)
+        )
+    else:
+        response['X-Sendfile'] = str(path)
+    return response
+
+
+def file_response(request, path, size, content_type, etag, last_modified):
+    """
+    Отдача файла самим Django. Весь файл отдаётся FileResponse, который
+    использует wsgi.file_wrapper (sendfile без копирования в Python),
+    часть файла - потоком блоков.
+    """
+    byte_range = None
+    header = request.META.get('HTTP_RANGE')
+    if header and if_range_passes(request, etag, last_modified):
+        byte_range = parse_range(header, size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range is None:
+        return FileResponse(open(path, 'rb'), content_type=content_type)
+    start, end = byte_range
+    response = StreamingHttpResponse(
+        _read_range(open(path, 'rb'), start, end - start + 1),
+        status=206,
+        content_type=content_type
+    )
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = end - start + 1
+    return response
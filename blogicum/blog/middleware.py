@@ -0,0 +1,274 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_vary_headers
+from django.utils.crypto import constant_time_compare
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+from core.constants import (COMPRESS_MIN_SIZE, COMPRESSIBLE_CONTENT_TYPES,
+                            TEMPLATE_PROFILE_HEADER, TEMPLATE_PROFILE_PARAM,
+                            USER_CACHE_TIMEOUT)
+
+from .caching import is_shared_cache, user_cache_key
+from .compression import (accepted_encodings, compress_content,
+                          compress_sequence, get_encoder)
+from .lazyload import start_detection, stop_detection
+from .profiling import start_profiling, stop_profiling
+
+PUBLIC_VIEW_NAMES = frozenset((
+    'blog:index',
+    'blog:category_posts',
+    'blog:post_detail',
+    'media',
+    'resized_image',
+    'static',
+))
+"""Публичные страницы, для которых работает быстрый путь анонимов."""
+
+
+def is_anonymous_fast_path(request):
+    """
+    Быстрый путь: GET/HEAD публичной страницы без cookie сессии.
+    У такого запроса нет ни сессии, ни пользователя, поэтому работа
+    с ними пропускается, а ответ не получает Vary: Cookie и может
+    раздаваться из общего кеша. Фронт-сервер при этом должен
+    пропускать мимо кеша запросы с cookie сессии.
+    """
+    if not hasattr(request, '_anonymous_fast_path'):
+        request._anonymous_fast_path = (
+            request.method in ('GET', 'HEAD')
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+            and _get_view_name(request.path_info) in PUBLIC_VIEW_NAMES
+        )
+    return request._anonymous_fast_path
+
+
+def _get_view_name(path):
+    try:
+        return resolve(path).view_name
+    except Resolver404:
+        return None
+
+
+class FastPathSessionMiddleware(SessionMiddleware):
+    """
+    SessionMiddleware, который на быстром пути выдаёт пустую сессию
+    без ключа и не трогает ответ: без cookie и без Vary: Cookie.
+    Если представление всё же изменило сессию, она сохраняется обычным
+    образом.
+    """
+
+    def process_request(self, request):
+        if is_anonymous_fast_path(request):
+            request.session = self.SessionStore()
+            return
+        super().process_request(request)
+
+    def process_response(self, request, response):
+        if is_anonymous_fast_path(request) and not request.session.modified:
+            return response
+        return super().process_response(request, response)
+
+
+def get_cached_user(request):
+    """
+    Аналог django.contrib.auth.get_user с кешем пользователя.
+    Пользователь берётся из кеша по id и версии, хеш сессии сверяется
+    так же, как при загрузке из БД. Версия меняется при сохранении
+    пользователя (в том числе при смене пароля и деактивации) и при
+    выходе. Смену версии должны видеть все воркеры, поэтому с кешем,
+    локальным для процесса, пользователь всегда загружается из БД.
+    """
+    if not is_shared_cache():
+        return auth.get_user(request)
+    try:
+        user_id = auth._get_user_session_key(request)
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    if user is not None:
+        session_hash = request.session.get(auth.HASH_SESSION_KEY)
+        if session_hash and constant_time_compare(
+            session_hash, user.get_session_auth_hash()
+        ):
+            return user
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(key, user, USER_CACHE_TIMEOUT)
+    return user
+
+
+class FastPathAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    На быстром пути пользователь сразу анонимный, без обращения к сессии.
+    В остальных запросах пользователь загружается через кеш.
+    """
+
+    def process_request(self, request):
+        if is_anonymous_fast_path(request):
+            request.user = AnonymousUser()
+            return
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+
+class FastPathMessageMiddleware(MessageMiddleware):
+    """На быстром пути хранилище сообщений не создаётся."""
+
+    def process_request(self, request):
+        if is_anonymous_fast_path(request):
+            return
+        super().process_request(request)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Сжатие ответов gzip или brotli (кодировки и уровни задаются
+    в RESPONSE_COMPRESSION). Потоковые ответы сжимаются по частям.
+    Уже сжатые ответы, части файлов, файлы, отдаваемые фронт-сервером,
+    и несжимаемые типы содержимого пропускаются.
+    Защита от BREACH: CSRF-токены Django маскируются в каждом ответе,
+    размер сжатого ответа дополняется случайной длиной, а ответы
+    с CSRF-токеном на межсайтовые запросы не сжимаются.
+    """
+
+    def should_compress(self, request, response):
+        content_type = response.get('Content-Type', '')
+        if (
+            response.has_header('Content-Encoding')
+            or response.has_header('Content-Range')
+            or response.has_header('X-Accel-Redirect')
+            or response.has_header('X-Sendfile')
+            or not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+        ):
+            return False
+        if (
+            not response.streaming
+            and len(response.content) < COMPRESS_MIN_SIZE
+        ):
+            return False
+        return not (
+            request.META.get('CSRF_COOKIE_USED')
+            and request.META.get('HTTP_SEC_FETCH_SITE') == 'cross-site'
+        )
+
+    def get_encoder(self, request, response):
+        """Первая кодировка из RESPONSE_COMPRESSION, принимаемая клиентом."""
+        accepted = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        for encoding, level in settings.RESPONSE_COMPRESSION.items():
+            if encoding in accepted:
+                encoder = get_encoder(
+                    encoding, level, response['Content-Type']
+                )
+                if encoder is not None:
+                    return encoder
+        return None
+
+    def process_response(self, request, response):
+        if not self.should_compress(request, response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoder = self.get_encoder(request, response)
+        if encoder is None:
+            return response
+        if response.streaming:
+            response.streaming_content = compress_sequence(
+                encoder, response.streaming_content
+            )
+            del response['Content-Length']
+        else:
+            compressed = compress_content(encoder, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoder.encoding
+        return response
+
+
+class TemplateProfilerMiddleware(MiddlewareMixin):
+    """
+    Профилирование шаблонов по запросу персонала: параметр
+    profile_templates или заголовок X-Profile-Templates. Отчёт по
+    шаблонам и тегам пишется в журнал, общее время отрисовки
+    передаётся в заголовке Server-Timing. Со значением flame ответ
+    заменяется свёрнутыми стеками для flamegraph.pl или speedscope.
+    """
+
+    def get_mode(self, request):
+        mode = (
+            request.GET.get(TEMPLATE_PROFILE_PARAM)
+            or request.META.get(TEMPLATE_PROFILE_HEADER)
+        )
+        if (
+            mode
+            and settings.TEMPLATE_PROFILING
+            and request.user.is_staff
+        ):
+            return mode
+        return None
+
+    def process_request(self, request):
+        request._template_profile_mode = self.get_mode(request)
+        if request._template_profile_mode:
+            request._template_profiler, request._template_profile_token = (
+                start_profiling()
+            )
+
+    def process_response(self, request, response):
+        if not getattr(request, '_template_profile_mode', None):
+            return response
+        profiler = request._template_profiler
+        try:
+            if response.streaming:
+                response.streaming_content = list(
+                    response.streaming_content
+                )
+        finally:
+            stop_profiling(request._template_profile_token)
+        profiler.log(request.get_full_path())
+        if request._template_profile_mode == 'flame':
+            return HttpResponse(
+                profiler.collapsed(),
+                content_type='text/plain; charset=utf-8'
+            )
+        response['Server-Timing'] = (
+            f'templates;dur={profiler.total() * 1000:.2f}'
+        )
+        return response
+
+
+class LazyLoadDetectionMiddleware:
+    """
+    Поиск N+1 на время обработки запроса, если задан
+    LAZY_LOAD_DETECTION. Потоковые ответы проверяются только до начала
+    отдачи.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.LAZY_LOAD_DETECTION:
+            return self.get_response(request)
+        token = start_detection()
+        try:
+            return self.get_response(request)
+        finally:
+            stop_detection(token)
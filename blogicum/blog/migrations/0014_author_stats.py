@@ -0,0 +1,30 @@
+# Generated by Django 3.2.16 on 2026-10-19 19:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0013_auto_20240811_1721'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='auth.user', verbose_name='Пользователь')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Публикаций')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя активность')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+    ]
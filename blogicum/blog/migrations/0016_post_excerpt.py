@@ -0,0 +1,37 @@
+# Generated by Django 3.2.16 on 2026-10-19 19:21
+
+from django.db import migrations, models
+
+from core.constants import EXCERPT_BATCH_SIZE
+
+
+def fill_excerpt(apps, schema_editor):
+    from blog.models import Post as CurrentPost
+
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.order_by('pk').only('pk', 'text')
+    last_pk = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last_pk)[:EXCERPT_BATCH_SIZE])
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+        for post in batch:
+            post.excerpt = CurrentPost.make_excerpt(post.text)
+        Post.objects.bulk_update(batch, ('excerpt',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=256, verbose_name='Анонс'),
+        ),
+        migrations.RunPython(fill_excerpt, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_alter_comment_options'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, db_index=True, upload_to='posts_images', verbose_name='Фото'),
+        ),
+    ]
@@ -1,12 +1,13 @@
 from django.contrib.auth import get_user_model
 from django.db import models
-from django.urls import reverse
+from django.utils.text import Truncator
 
-from core.constants import STANDART_MAX_LENGHT
+from core.constants import EXCERPT_WORDS, STANDART_MAX_LENGHT
 from core.models import CreatedAtModel, PublishedModel
 
 from .managers import PublishedPostManager
 from .querysets import PostQuerySet
+from .urlbuilder import build_url
 
 User = get_user_model()
 
@@ -48,6 +49,24 @@ class Category(PublishedModel, CreatedAtModel):
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
 
+    def save(self, *args, **kwargs):
+        """
+        При смене доступности категории флаг is_visible её постов
+        пересчитывается пачками.
+        """
+        was_published = (
+            Category.objects
+            .filter(pk=self.pk)
+            .values_list('is_published', flat=True)
+            .first()
+        ) if self.pk else None
+        super().save(*args, **kwargs)
+        if was_published is not None and was_published != self.is_published:
+            self.posts.all().update_visibility(self.is_published)
+
+    def get_absolute_url(self):
+        return build_url('blog:category_posts', self.slug)
+
     def __str__(self):
         return self.title
 
@@ -87,6 +106,10 @@ class Post(PublishedModel, CreatedAtModel):
         location - ключ, местоположение
         category - ключ, категория поста
         is_published - доступность поста
+        is_visible - поддерживаемый флаг: пост и его категория опубликованы
+        excerpt - начало текста для карточек лент, рассчитывается при
+            сохранении
+        view_count - количество просмотров, записывается пачками
         created_at - дата и время создания поста
     """
 
@@ -133,28 +156,79 @@ class Post(PublishedModel, CreatedAtModel):
     )
     image = models.ImageField(
         blank=True,
+        db_index=True,
         upload_to='posts_images',
         verbose_name='Фото'
     )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Виден в лентах',
+        help_text=(
+            'Рассчитывается автоматически: пост и его категория '
+            'опубликованы.'
+        )
+    )
+    excerpt = models.CharField(
+        max_length=STANDART_MAX_LENGHT,
+        blank=True,
+        editable=False,
+        verbose_name='Анонс'
+    )
+    view_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Просмотры'
+    )
     objects = PostQuerySet.as_manager()
     published = PublishedPostManager()
     """
     Объекты Post, которые:
     1) Имеют актуальную дату
-    2) Опубликованы
-    3) Имеют опубликованную категорию
-    4) Отсортированы по дате публикации
+    2) Опубликованы и имеют опубликованную категорию (флаг is_visible)
+    3) Отсортированы по дате публикации
     """
 
     class Meta(CreatedAtModel.Meta):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('is_visible', '-pub_date'),
+                name='post_visible_pub_date_idx'
+            ),
+        )
 
-    def get_absolute_url(self):
-        return reverse(
-            'blog:profile', kwargs={'username': self.author.username}
+    @staticmethod
+    def make_excerpt(text):
+        """Анонс текста: как фильтр truncatewords в карточке поста."""
+        return Truncator(
+            Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+        ).chars(STANDART_MAX_LENGHT)
+
+    def save(self, *args, **kwargs):
+        """
+        Пересчёт флага is_visible и анонса при каждом сохранении поста.
+        """
+        self.is_visible = self.is_published and (
+            self.category_id is not None
+            and Category.objects.filter(
+                pk=self.category_id, is_published=True
+            ).exists()
         )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            self.excerpt = self.make_excerpt(self.text)
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields, 'is_visible', 'excerpt'
+            }
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        """Адрес страницы поста; автор для него не загружается."""
+        return build_url('blog:post_detail', self.pk)
 
     def __str__(self):
         return self.title
@@ -189,3 +263,44 @@ class Comment(CreatedAtModel):
 
     def __str__(self):
         return self.text
+
+
+class AuthorStats(models.Model):
+    """
+    Модель для хранения предрассчитанной статистики автора.
+    Поддерживается сигналами при записи постов и комментариев,
+    сверяется командой recount_author_stats.
+    Содержит поля:
+        user (обязательное, первичный ключ) - пользователь
+        post_count - количество публикаций пользователя
+        comment_count - количество комментариев пользователя
+        last_activity_at - дата и время последней публикации или комментария
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Пользователь'
+    )
+    post_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Публикаций'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Комментариев'
+    )
+    last_activity_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Последняя активность'
+    )
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return f'Статистика {self.user_id}'
@@ -0,0 +1,35 @@
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+from .caching import get_or_recompute
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Пагинатор, который берёт количество объектов из кеша с защитой
+    от одновременного пересчёта, чтобы закешированная страница ленты
+    не требовала запроса COUNT.
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        cache_key,
+        timeout,
+        generation=None,
+        **kwargs
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+        self.timeout = timeout
+        self.generation = generation
+
+    @cached_property
+    def count(self):
+        return get_or_recompute(
+            self.cache_key,
+            lambda: Paginator.count.func(self),
+            self.timeout,
+            generation=self.generation
+        )
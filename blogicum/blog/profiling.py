@@ -0,0 +1,137 @@
+import logging
+from collections import defaultdict
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.template.base import Node, Template, TokenType
+
+logger = logging.getLogger(__name__)
+
+_active_profiler = ContextVar('template_profiler', default=None)
+
+
+class TemplateProfiler:
+    """
+    Замер отрисовки шаблонов одного запроса. Для каждого шаблона
+    (включая подключённые через include и extends) и каждого тега
+    считаются число вызовов и суммарное время. Время вложенных вызовов
+    входит в суммарное время внешних. Для флейм-графа копится
+    собственное время каждого стека вызовов.
+    """
+
+    def __init__(self):
+        self.calls = defaultdict(int)
+        self.totals = defaultdict(float)
+        self.stacks = defaultdict(float)
+        self._frames = []
+        self._children = []
+
+    def measure(self, frame, func, *args):
+        self._frames.append(frame)
+        self._children.append(0.0)
+        started = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = perf_counter() - started
+            self.stacks[';'.join(self._frames)] += (
+                elapsed - self._children.pop()
+            )
+            self._frames.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            if frame not in self._frames:
+                self.totals[frame] += elapsed
+            self.calls[frame] += 1
+
+    def total(self):
+        """Общее время отрисовки шаблонов в секундах."""
+        return sum(self.stacks.values())
+
+    def summary(self):
+        """Строки (кадр, вызовы, время в мс) по убыванию времени."""
+        return [
+            (frame, self.calls[frame], self.totals[frame] * 1000)
+            for frame in sorted(
+                self.totals, key=self.totals.get, reverse=True
+            )
+        ]
+
+    def collapsed(self):
+        """
+        Свёрнутые стеки в формате flamegraph.pl и speedscope:
+        «кадр;кадр;кадр время» в микросекундах, по строке на стек.
+        """
+        return ''.join(
+            f'{stack} {round(elapsed * 10 ** 6)}\n'
+            for stack, elapsed in sorted(self.stacks.items())
+        )
+
+    def log(self, path):
+        lines = [
+            f'{elapsed:9.2f} ms {calls:5} x {frame}'
+            for frame, calls, elapsed in self.summary()
+        ]
+        logger.info(
+            'Отрисовка шаблонов %s:\n%s', path, '\n'.join(lines)
+        )
+
+
+def start_profiling():
+    """
+    Включение профилировщика в текущем контексте.
+    Возвращает профилировщик и токен для stop_profiling.
+    """
+    install_template_profiler()
+    profiler = TemplateProfiler()
+    return profiler, _active_profiler.set(profiler)
+
+
+def stop_profiling(token):
+    _active_profiler.reset(token)
+
+
+def _get_tag_frame(node):
+    token = getattr(node, 'token', None)
+    if token is None or token.token_type != TokenType.BLOCK:
+        return None
+    bits = token.split_contents()
+    if bits[0] == 'block':
+        return '{% ' + ' '.join(bits[:2]) + ' %}'
+    return '{% ' + bits[0] + ' %}'
+
+
+def install_template_profiler():
+    """
+    Обёртки над Template._render и Node.render_annotated. Без активного
+    профилировщика они только проверяют переменную контекста.
+    Повторный вызов ставит обёртку заново, если Template._render
+    подменили (например, инструментирование шаблонов в тестах).
+    """
+    if getattr(Template._render, 'profiled', False):
+        return
+    render_template = Template._render
+    render_node = getattr(
+        Node.render_annotated, 'wrapped', Node.render_annotated
+    )
+
+    def _render(self, context):
+        profiler = _active_profiler.get()
+        if profiler is None:
+            return render_template(self, context)
+        name = self.origin.template_name or self.name or '<string>'
+        return profiler.measure(name, render_template, self, context)
+
+    def render_annotated(self, context):
+        profiler = _active_profiler.get()
+        if profiler is None:
+            return render_node(self, context)
+        frame = _get_tag_frame(self)
+        if frame is None:
+            return render_node(self, context)
+        return profiler.measure(frame, render_node, self, context)
+
+    _render.profiled = True
+    render_annotated.wrapped = render_node
+    Template._render = _render
+    Node.render_annotated = render_annotated
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from core.constants import PUBLICATION_EPOCH_SECONDS
+
+from .caching import bump_generations, post_feeds
+
+LAST_EPOCH_KEY = 'publication:last-epoch'
+"""Ключ кеша с последней обработанной планировщиком эпохой."""
+
+
+def publication_epoch(now=None):
+    """
+    Начало текущего окна публикации.
+    Все запросы внутри окна сравнивают pub_date с одним и тем же
+    значением, поэтому их SQL и результаты можно кешировать совместно.
+    """
+    now = now or timezone.now()
+    offset = now.timestamp() % PUBLICATION_EPOCH_SECONDS
+    return now - timedelta(seconds=offset)
+
+
+def next_epoch(epoch):
+    """Начало следующего окна публикации."""
+    return epoch + timedelta(seconds=PUBLICATION_EPOCH_SECONDS)
+
+
+def publish_due_posts(since, until):
+    """
+    Выпуск отложенных постов, чья дата публикации наступила в окне
+    (since, until]: поколения их лент увеличиваются.
+    Возвращает адреса лент, которые стоит прогреть.
+    """
+    from .models import Post
+
+    due_posts = (
+        Post.objects
+        .visible()
+        .filter(pub_date__gt=since, pub_date__lte=until)
+        .values_list(
+            'category_id',
+            'author_id',
+            'category__slug',
+            'author__username',
+            named=True
+        )
+    )
+    feeds = set()
+    urls = set()
+    for post in due_posts:
+        feeds.update(post_feeds(post))
+        urls.add(reverse('blog:index'))
+        urls.add(reverse('blog:category_posts', args=(post.category__slug,)))
+        urls.add(reverse('blog:profile', args=(post.author__username,)))
+    bump_generations(*feeds)
+    return sorted(urls)
+
+
+def run_publication_tick():
+    """
+    Один шаг планировщика: обработка постов, ставших доступными с
+    прошлого шага. Возвращает текущую эпоху и адреса для прогрева.
+    """
+    epoch = publication_epoch()
+    since = cache.get(
+        LAST_EPOCH_KEY,
+        epoch - timedelta(seconds=PUBLICATION_EPOCH_SECONDS)
+    )
+    urls = []
+    if epoch > since:
+        urls = publish_due_posts(since, epoch)
+        cache.set(LAST_EPOCH_KEY, epoch, None)
+    return epoch, urls
@@ -1,14 +1,48 @@
 from django.db import models
-from django.db.models import Count
-from django.utils import timezone
+from django.db.models import Count, F
+from django.db.models.query import ModelIterable
+
+from core.constants import VISIBILITY_BATCH_SIZE
+
+from .publication import publication_epoch
+from .reference import hydrate_references
 
 
 class PostQuerySet(models.QuerySet):
     """Отдельная фильтрация QurySet для постов"""
 
+    _hydrate_references = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._hydrate_references = self._hydrate_references
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is not None
+        super()._fetch_all()
+        if (
+            not fetched
+            and self._hydrate_references
+            and self._iterable_class is ModelIterable
+        ):
+            hydrate_references(self._result_cache)
+
+    def with_cached_references(self):
+        """
+        Категории и локации подставляются из кеша процесса после загрузки
+        постов, поэтому JOIN этих таблиц в запросе не нужен.
+        """
+        clone = self._chain()
+        clone._hydrate_references = True
+        return clone
+
     def with_actual_data(self):
-        """Фильтрация актуальной даты."""
-        return self.filter(pub_date__lte=timezone.now())
+        """
+        Фильтрация актуальной даты. Сравнение идёт с началом текущего
+        окна публикации, чтобы одинаковые запросы внутри окна совпадали.
+        """
+        return self.filter(pub_date__lte=publication_epoch())
 
     def published(self):
         """Фильтрация доступности для публикации."""
@@ -18,6 +52,30 @@ class PostQuerySet(models.QuerySet):
         """Фильтрация доступности категории."""
         return self.filter(category__is_published=True)
 
+    def visible(self):
+        """
+        Фильтрация по флагу is_visible: пост и категория опубликованы.
+        В отличие от category_published() не требует JOIN категории.
+        """
+        return self.filter(is_visible=True)
+
+    def update_visibility(
+        self, category_published, batch_size=VISIBILITY_BATCH_SIZE
+    ):
+        """
+        Пересчёт флага is_visible пачками после смены доступности
+        категории, чтобы не блокировать таблицу надолго.
+        """
+        visible = F('is_published') if category_published else False
+        pks = self.order_by('pk').values_list('pk', flat=True)
+        last_pk = 0
+        while True:
+            batch = list(pks.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return
+            last_pk = batch[-1]
+            self.model.objects.filter(pk__in=batch).update(is_visible=visible)
+
     def ordered_by_pub_date(self):
         """Сортировка постов по дате публикации (по убыванию)."""
         return self.order_by('-pub_date')
@@ -25,3 +83,17 @@ class PostQuerySet(models.QuerySet):
     def with_comment_count(self):
         """Аннотирование комментариев"""
         return self.annotate(comment_count=Count('comments'))
+
+    def for_feed(self):
+        """
+        Выборка для карточек лент: число комментариев и связанные объекты.
+        Полный текст не загружается - карточки выводят поле excerpt.
+        Категории и локации берутся из кеша справочников.
+        """
+        return (
+            self
+            .with_comment_count()
+            .select_related('author')
+            .with_cached_references()
+            .defer('text')
+        )
@@ -0,0 +1,89 @@
+import threading
+import time
+
+from django.apps import apps
+
+from core.constants import REFERENCE_CACHE_TTL
+
+from .caching import bump_generations, get_generations
+
+
+class ReferenceCache:
+    """
+    Кеш процесса для небольших, редко меняющихся таблиц.
+    Все строки хранятся в словарях по pk и по указанным полям.
+    Кеш перечитывается по истечении REFERENCE_CACHE_TTL или при смене
+    поколения в общем кеше, которое увеличивается сигналами
+    при записи, в том числе из других процессов.
+    """
+
+    def __init__(self, model_label, lookup_fields=()):
+        self.model_label = model_label
+        self.lookup_fields = lookup_fields
+        self.generation_name = f'reference:{model_label}'
+        self._lock = threading.Lock()
+        self._state = None
+
+    def _load(self, generation):
+        objects = list(apps.get_model(self.model_label).objects.all())
+        return (
+            time.monotonic(),
+            generation,
+            {obj.pk: obj for obj in objects},
+            {
+                field: {getattr(obj, field): obj for obj in objects}
+                for field in self.lookup_fields
+            },
+        )
+
+    def _get_state(self):
+        generation = get_generations(self.generation_name)[0]
+        state = self._state
+        if (
+            state is None
+            or state[1] != generation
+            or time.monotonic() - state[0] > REFERENCE_CACHE_TTL
+        ):
+            state = self._load(generation)
+            with self._lock:
+                self._state = state
+        return state
+
+    def get_map(self):
+        """Словарь pk -> объект."""
+        return self._get_state()[2]
+
+    def get(self, pk):
+        return self.get_map().get(pk)
+
+    def get_by(self, field, value):
+        """Поиск по одному из полей lookup_fields."""
+        return self._get_state()[3][field].get(value)
+
+    def invalidate(self):
+        bump_generations(self.generation_name)
+
+
+categories = ReferenceCache('blog.Category', lookup_fields=('slug',))
+locations = ReferenceCache('blog.Location')
+
+
+def hydrate_references(posts):
+    """
+    Подстановка категорий и локаций постов из кеша процесса вместо
+    JOIN в запросе.
+    """
+    if not posts:
+        return
+    model = type(posts[0])
+    category_field = model._meta.get_field('category')
+    location_field = model._meta.get_field('location')
+    category_map = categories.get_map()
+    location_map = locations.get_map()
+    for post in posts:
+        category_field.set_cached_value(
+            post, category_map.get(post.category_id)
+        )
+        location_field.set_cached_value(
+            post, location_map.get(post.location_id)
+        )
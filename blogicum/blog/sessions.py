@@ -0,0 +1,33 @@
+import logging
+
+from django.conf import settings
+from django.contrib.sessions.backends import signed_cookies
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(signed_cookies.SessionStore):
+    """
+    Сессия в подписанной cookie с ограничением размера.
+    Браузеры молча отбрасывают cookie больше ~4 КБ, что выглядит как
+    внезапный выход из аккаунта. Поэтому переполненная сессия
+    не записывается: в журнал пишется предупреждение, а клиент
+    сохраняет прежнюю cookie (или получает пустую сессию, если
+    прежней не было). Запрос при этом завершается как обычно.
+    """
+
+    def save(self, must_create=False):
+        session_key = self._get_session_key()
+        if len(session_key) > settings.SESSION_COOKIE_MAX_SIZE:
+            logger.warning(
+                'Размер сессии %s байт превышает SESSION_COOKIE_MAX_SIZE=%s, '
+                'изменения сессии не сохранены',
+                len(session_key),
+                settings.SESSION_COOKIE_MAX_SIZE,
+            )
+            if self._session_key is not None:
+                return
+            self._session_cache = {}
+            session_key = self._get_session_key()
+        self._session_key = session_key
+        self.modified = True
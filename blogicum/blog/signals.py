@@ -0,0 +1,143 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from .caching import (GLOBAL_FEED, bump_generations, forget_missing,
+                      invalidate_cached_user, post_feeds)
+from .models import Category, Comment, Location, Post
+from .reference import categories, locations
+from .stats import bump_author_stats
+from .storage import release_file
+
+User = get_user_model()
+
+REFERENCE_CACHES = {
+    Category: categories,
+    Location: locations,
+}
+
+
+@receiver(post_init, sender=Post)
+def post_loaded(sender, instance, **kwargs):
+    """
+    Запоминание изображения, с которым пост загружен из БД, чтобы
+    при замене освободить прежний файл без дополнительного запроса.
+    Значение берётся из __dict__, чтобы не загружать отложенное поле.
+    """
+    image = instance.__dict__.get('image')
+    instance._previous_image = getattr(image, 'name', image)
+
+
+@receiver(post_save, sender=Post)
+def post_image_changed(sender, instance, created, **kwargs):
+    """Освобождение заменённого изображения после фиксации транзакции."""
+    if 'image' not in instance.__dict__:
+        return
+    previous = instance._previous_image
+    instance._previous_image = instance.image.name
+    if not created and previous and previous != instance.image.name:
+        transaction.on_commit(lambda: release_file(previous))
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    """
+    Учёт новой публикации в статистике автора и инвалидация лент.
+    При изменении поста могла смениться категория, поэтому
+    инвалидируются все ленты.
+    Новый id мог быть запомнен как отсутствующий.
+    """
+    if created:
+        bump_author_stats(
+            instance.author_id, created_at=instance.created_at, post_count=1
+        )
+        bump_generations(*post_feeds(instance))
+        forget_missing('post')
+    else:
+        bump_generations(GLOBAL_FEED)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    """
+    Учёт удалённой публикации в статистике автора и в лентах.
+    Изображение удаляется, если на него не ссылаются другие посты.
+    """
+    bump_author_stats(instance.author_id, post_count=-1)
+    bump_generations(*post_feeds(instance))
+    if instance.image:
+        name = instance.image.name
+        transaction.on_commit(lambda: release_file(name))
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    """
+    Учёт нового комментария в статистике автора и инвалидация лент
+    с количеством комментариев к посту.
+    Список комментариев поста сбрасывается и при их изменении.
+    """
+    bump_generations(f'comments:{instance.comment_post_id}')
+    if created:
+        bump_author_stats(
+            instance.author_id,
+            created_at=instance.created_at,
+            comment_count=1
+        )
+        bump_generations(*post_feeds(instance.comment_post))
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    """Учёт удалённого комментария в статистике автора и в лентах."""
+    bump_author_stats(instance.author_id, comment_count=-1)
+    bump_generations(GLOBAL_FEED, f'comments:{instance.comment_post_id}')
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    """Посты удаляемой категории теряют категорию и видимость в лентах."""
+    instance.posts.all().update_visibility(False)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def reference_changed(sender, **kwargs):
+    """
+    Названия категорий и локаций выводятся во всех лентах, а сами они
+    хранятся в кеше справочников процессов.
+    """
+    bump_generations(GLOBAL_FEED)
+    REFERENCE_CACHES[sender].invalidate()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    """
+    Сброс закешированного пользователя (правка профиля, смена пароля).
+    Имя автора выводится в лентах, но обновление last_login при входе
+    на содержимое лент не влияет и их инвалидацию не вызывает.
+    Новое имя пользователя могло быть запомнено как отсутствующее.
+    """
+    invalidate_cached_user(instance.pk)
+    if update_fields is None or set(update_fields) - {'last_login'}:
+        bump_generations(GLOBAL_FEED)
+        forget_missing('user')
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    """Удалённый пользователь не должен оставаться в кеше."""
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def user_logged_out_handler(sender, request, user, **kwargs):
+    """Выход сбрасывает закешированного пользователя."""
+    if user is not None:
+        invalidate_cached_user(user.pk)
@@ -0,0 +1,93 @@
+import gzip
+import logging
+import os
+import re
+
+from django.contrib.staticfiles.storage import (ManifestStaticFilesStorage,
+                                                StaticFilesStorage)
+
+from core.constants import (STATIC_COMPRESS_EXTENSIONS,
+                            STATIC_COMPRESS_MIN_SIZE)
+
+from .compression import accepted_encodings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+"""Имя файла с хешем содержимого, добавленным ManifestStaticFilesStorage."""
+
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+"""Сжатые копии в порядке предпочтения: кодировка и суффикс файла."""
+
+
+def compress_gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+def is_hashed_name(name):
+    return HASHED_NAME.search(name) is not None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Хранилище статических файлов с хешем содержимого в имени.
+    После обработки collectstatic рядом с текстовыми файлами
+    записываются сжатые копии .gz и (если установлен пакет brotli)
+    .br, чтобы не сжимать их при каждом запросе.
+    Если манифеста ещё нет (collectstatic не выполнялся, например,
+    при разработке), то ссылки ведут на исходные имена.
+    """
+
+    def url(self, name, force=False):
+        try:
+            return super().url(name, force)
+        except ValueError:
+            logger.warning('Статический файл %s отсутствует в манифесте', name)
+            return StaticFilesStorage.url(self, name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            self.compress(name)
+
+    def compress(self, name):
+        """Запись сжатых копий файла, если они меньше исходного."""
+        extension = os.path.splitext(name)[1].lower()
+        if extension not in STATIC_COMPRESS_EXTENSIONS:
+            return
+        path = self.path(name)
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < STATIC_COMPRESS_MIN_SIZE:
+            return
+        compressors = [('.gz', compress_gzip)]
+        if brotli is not None:
+            compressors.append(('.br', compress_brotli))
+        for suffix, compressor in compressors:
+            compressed = compressor(data)
+            if len(compressed) < len(data):
+                with open(path + suffix, 'wb') as file:
+                    file.write(compressed)
+
+
+def find_variant(path, accept_encoding):
+    """
+    Выбор сжатой копии файла по Accept-Encoding.
+    Возвращает (путь, кодировка) или (path, None) для исходного файла.
+    """
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, suffix in ENCODINGS:
+        if encoding in accepted and os.path.isfile(path + suffix):
+            return path + suffix, encoding
+    return path, None
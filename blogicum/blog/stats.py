@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import (Count, F, IntegerField, Max, OuterRef, Subquery,
+                              Value)
+from django.db.models.functions import Coalesce, Greatest
+
+from core.constants import STATS_BATCH_SIZE
+
+from .models import AuthorStats, Comment, Post
+
+User = get_user_model()
+
+
+def bump_author_stats(user_id, created_at=None, **deltas):
+    """
+    Инкрементальное обновление статистики автора.
+    deltas - изменения счётчиков (например, post_count=1),
+    created_at - время нового действия для поля last_activity_at.
+    Если строки статистики ещё нет, то при добавлении записи она
+    рассчитывается с нуля, а при удалении - пропускается.
+    """
+    updates = {
+        field: Greatest(F(field) + delta, Value(0))
+        for field, delta in deltas.items()
+    }
+    if created_at is not None:
+        updates['last_activity_at'] = Greatest(
+            Coalesce(F('last_activity_at'), Value(created_at)),
+            Value(created_at)
+        )
+    updated = AuthorStats.objects.filter(user_id=user_id).update(**updates)
+    if not updated and created_at is not None:
+        recount_author_stats([user_id])
+
+
+def _author_subquery(model, aggregate):
+    """Подзапрос агрегата по записям автора для аннотации пользователей."""
+    return Subquery(
+        model.objects
+        .filter(author=OuterRef('pk'))
+        .order_by()
+        .values('author')
+        .annotate(result=aggregate)
+        .values('result')
+    )
+
+
+def recount_author_stats(user_ids=None, batch_size=STATS_BATCH_SIZE):
+    """
+    Полный пересчёт статистики авторов пачками.
+    Если user_ids не передан, то пересчитываются все пользователи.
+    Возвращает количество обработанных пользователей.
+    """
+    users = User.objects.order_by('pk')
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    users = users.annotate(
+        post_total=Coalesce(
+            _author_subquery(Post, Count('pk')),
+            Value(0),
+            output_field=IntegerField()
+        ),
+        comment_total=Coalesce(
+            _author_subquery(Comment, Count('pk')),
+            Value(0),
+            output_field=IntegerField()
+        ),
+        last_post_at=_author_subquery(Post, Max('created_at')),
+        last_comment_at=_author_subquery(Comment, Max('created_at')),
+    ).values_list(
+        'pk', 'post_total', 'comment_total', 'last_post_at', 'last_comment_at'
+    )
+    processed = 0
+    last_pk = 0
+    while True:
+        batch = list(users.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return processed
+        last_pk = batch[-1][0]
+        processed += len(batch)
+        rows = {
+            pk: AuthorStats(
+                user_id=pk,
+                post_count=post_total,
+                comment_count=comment_total,
+                last_activity_at=max(
+                    filter(None, (last_post_at, last_comment_at)),
+                    default=None
+                )
+            )
+            for pk, post_total, comment_total, last_post_at, last_comment_at
+            in batch
+        }
+        with transaction.atomic():
+            existing = set(
+                AuthorStats.objects
+                .filter(user_id__in=rows)
+                .values_list('user_id', flat=True)
+            )
+            AuthorStats.objects.bulk_update(
+                [rows[pk] for pk in existing],
+                ('post_count', 'comment_count', 'last_activity_at')
+            )
+            AuthorStats.objects.bulk_create(
+                [row for pk, row in rows.items() if pk not in existing]
+            )
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import posixpath
+import re
+from datetime import timedelta
+
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.utils import timezone
+
+from core.constants import MEDIA_GC_GRACE_PERIOD
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+CONTENT_ADDRESSED_NAME = re.compile(
+    r'(?:^|/)([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}(?:\.\w+)?$'
+)
+"""Имя файла в хранилище: <каталог>/ab/cd/abcd<sha256>.<расширение>."""
+
+
+def content_hash(content):
+    """SHA-256 содержимого файла, читаемого по частям."""
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in iter(lambda: content.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def content_addressed_name(name, digest):
+    """
+    Имя файла по хешу содержимого с двумя уровнями каталогов,
+    чтобы в одном каталоге не оказывалось слишком много файлов.
+    Каталог upload_to и расширение исходного имени сохраняются.
+    """
+    directory, filename = posixpath.split(name)
+    extension = os.path.splitext(filename)[1].lower()
+    return posixpath.join(
+        directory, digest[:2], digest[2:4], digest + extension
+    )
+
+
+def is_content_addressed(name):
+    return bool(name) and CONTENT_ADDRESSED_NAME.search(name) is not None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище, в котором имя файла определяется хешем
+    содержимого. Повторная загрузка того же файла не записывает
+    его второй раз, а возвращает имя уже сохранённой копии и обновляет
+    её время изменения: пока пост с новой ссылкой не сохранён, файл
+    защищён периодом ожидания от release_file и gc_media.
+    Удаление файла, на который ещё ссылаются записи, выполняется
+    через release_file.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        """
+        Итоговое имя всё равно вычисляется по содержимому в _save,
+        поэтому проверка занятости исходного имени не нужна.
+        """
+        return name
+
+    def touch(self, name):
+        """Обновление времени изменения уже сохранённого файла."""
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _save(self, name, content):
+        name = content_addressed_name(name, content_hash(content))
+        if self.touch(name):
+            return name
+        try:
+            return super()._save(name, content)
+        except FileExistsError:
+            self.touch(name)
+            return name
+
+    def save_existing(self, path, name):
+        """
+        Перенос файла с диска в хранилище (без копирования, если
+        такого содержимого ещё нет). Возвращает новое имя.
+        """
+        with open(path, 'rb') as file:
+            new_name = content_addressed_name(name, content_hash(file))
+        if self.touch(new_name):
+            return new_name
+        target = self.path(new_name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.link(path, target)
+        return new_name
+
+
+def get_reference_count(name):
+    """Количество постов, ссылающихся на файл."""
+    from .models import Post
+
+    return Post.objects.filter(image=name).count()
+
+
+def release_file(name, storage=None):
+    """
+    Удаление файла хранилища, если на него больше не ссылается
+    ни один пост. Одинаковые загрузки разделяют один файл, поэтому
+    удалить его при удалении одного из постов нельзя.
+    Файл, изменённый в течение периода ожидания, не удаляется: его
+    могли только что загрузить повторно для поста, который ещё
+    не сохранён. Такие файлы позже удаляет gc_media.
+    Возвращает True, если файл удалён.
+    """
+    storage = storage or default_storage
+    if not is_content_addressed(name) or get_reference_count(name):
+        return False
+    try:
+        modified = storage.get_modified_time(name)
+    except FileNotFoundError:
+        return False
+    if modified > timezone.now() - timedelta(seconds=MEDIA_GC_GRACE_PERIOD):
+        return False
+    storage.delete(name)
+    return True
@@ -0,0 +1,42 @@
+from django.template.loader import get_template
+from django.utils.crypto import get_random_string
+
+
+class FeedStream:
+    """
+    Потоковая отрисовка ленты. Страница рендерится без карточек:
+    на их месте тег {% feed_cache %} оставляет метку и передаёт сюда
+    генератор частей. Начало страницы (head и шапка) отдаётся сразу,
+    затем карточки по одной по мере отрисовки, затем конец страницы.
+    """
+
+    def __init__(self, items, item_template, item_name='post'):
+        self.items = items
+        self.item_template = item_template
+        self.item_name = item_name
+        self.marker = f'<!-- feed-stream:{get_random_string(16)} -->'
+        self.chunks = None
+
+    def defer(self, chunks):
+        """Запоминание генератора частей ленты; возвращает метку."""
+        self.chunks = chunks
+        return self.marker
+
+    def render_items(self, context):
+        """
+        Отрисовка карточек по одной в контексте страницы. Контекст
+        привязывается к шаблону один раз, поэтому контекст-процессоры
+        не вызываются для каждой карточки.
+        """
+        template = get_template(self.item_template).template
+        with context.bind_template(template):
+            for item in self.items:
+                with context.push({self.item_name: item}):
+                    yield template.render(context)
+
+    def stream(self, html):
+        head, marker, tail = html.partition(self.marker)
+        yield head
+        if marker:
+            yield from self.chunks
+        yield tail
@@ -0,0 +1,15 @@
+from django import template
+
+from blog.urlbuilder import build_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def fast_url(name, *args):
+    """
+    Аналог {% url %} для горячих маршрутов (карточки постов,
+    комментарии): адрес собирается по шаблону, построенному один раз
+    на процесс, без полного обхода резолвера.
+    """
+    return build_url(name, *args)
@@ -0,0 +1,65 @@
+from django import template
+from django.core.cache.utils import make_template_fragment_key
+
+from blog.caching import get_or_recompute, stream_or_recompute
+
+register = template.Library()
+
+
+class FeedCacheNode(template.Node):
+
+    def __init__(self, nodelist, timeout, fragment_name, generation, vary_on):
+        self.nodelist = nodelist
+        self.timeout = timeout
+        self.fragment_name = fragment_name
+        self.generation = generation
+        self.vary_on = vary_on
+
+    def render(self, context):
+        key = make_template_fragment_key(
+            self.fragment_name,
+            [var.resolve(context) for var in self.vary_on]
+        )
+        timeout = int(self.timeout.resolve(context))
+        generation = self.generation.resolve(context)
+        stream = context.get('feed_stream')
+        if stream is not None:
+            return stream.defer(stream_or_recompute(
+                key,
+                lambda: stream.render_items(context),
+                timeout,
+                generation=generation
+            ))
+        return get_or_recompute(
+            key,
+            lambda: self.nodelist.render(context),
+            timeout,
+            generation=generation
+        )
+
+
+@register.tag
+def feed_cache(parser, token):
+    """
+    Аналог {% cache %} с защитой от одновременного пересчёта:
+    {% feed_cache timeout name generation [vary_on ...] %}
+    Поколение хранится вместе с фрагментом, поэтому после инвалидации
+    ленты фрагмент пересчитывает один запрос, а остальные получают
+    предыдущую версию.
+    В потоковом режиме (в контексте есть feed_stream) фрагмент
+    отрисовывается позже, по одной карточке.
+    """
+    nodelist = parser.parse(('endfeed_cache',))
+    parser.delete_first_token()
+    tokens = token.split_contents()
+    if len(tokens) < 4:
+        raise template.TemplateSyntaxError(
+            f"'{tokens[0]}' tag requires at least 3 arguments."
+        )
+    return FeedCacheNode(
+        nodelist,
+        parser.compile_filter(tokens[1]),
+        tokens[2],
+        parser.compile_filter(tokens[3]),
+        [parser.compile_filter(token) for token in tokens[4:]],
+    )
@@ -0,0 +1,44 @@
+import threading
+
+from django import template
+from django_bootstrap5.forms import render_form
+
+from blog.caching import get_feed_generations
+
+register = template.Library()
+
+_lock = threading.Lock()
+_rendered = {}
+"""Разметка чистых форм: класс формы -> (поколение, HTML)."""
+
+
+def is_pristine(form):
+    """
+    Форма не привязана к данным и не заполнена ничем, кроме значений
+    по умолчанию, поэтому её разметка одинакова во всех запросах.
+    """
+    instance = getattr(form, 'instance', None)
+    if form.is_bound or (instance is not None and instance.pk is not None):
+        return False
+    return form.initial == type(form)().initial
+
+
+@register.simple_tag
+def cached_bootstrap_form(form):
+    """
+    Аналог {% bootstrap_form %}, который рендерит чистую форму один раз
+    на процесс. Выбор категорий и локаций берётся из БД, поэтому
+    разметка перестраивается при смене общего поколения лент.
+    CSRF-токен и адрес формы остаются в шаблоне и выводятся в каждом
+    запросе.
+    """
+    if not is_pristine(form):
+        return render_form(form)
+    form_class = type(form)
+    generation = get_feed_generations()[0]
+    cached = _rendered.get(form_class)
+    if cached is None or cached[0] != generation:
+        cached = (generation, render_form(form))
+        with _lock:
+            _rendered[form_class] = cached
+    return cached[1]
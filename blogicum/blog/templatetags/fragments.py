@@ -0,0 +1,48 @@
+from django import template
+from django.conf import settings
+from django.urls import reverse
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+FRAGMENT_LOADER = mark_safe(
+    '<script>'
+    'document.querySelectorAll("[data-fragment]").forEach(function (el) {'
+    'fetch(el.dataset.fragment, {credentials: "same-origin"})'
+    '.then(function (response) { return response.text(); })'
+    '.then(function (html) { el.outerHTML = html; });'
+    '});'
+    '</script>'
+)
+"""Скрипт, подгружающий персональные фрагменты в режиме js."""
+
+
+@register.simple_tag(takes_context=True)
+def fragment(context, template_name, url_name, *args):
+    """
+    Персональный фрагмент страницы.
+    В зависимости от FRAGMENTS_MODE:
+        inline - шаблон фрагмента выводится прямо в странице;
+        esi - выводится <esi:include>, фрагмент подставит фронт-сервер;
+        js - выводится заглушка, фрагмент подгрузит скрипт в браузере.
+    В режимах esi и js сама страница не зависит от пользователя
+    и может кешироваться целиком.
+    """
+    mode = settings.FRAGMENTS_MODE
+    if mode == 'inline':
+        return context.template.engine.get_template(
+            template_name
+        ).render(context)
+    url = reverse(url_name, args=args)
+    if mode == 'esi':
+        return format_html('<esi:include src="{}" />', url)
+    return format_html('<div data-fragment="{}"></div>', url)
+
+
+@register.simple_tag
+def fragment_loader():
+    """Загрузчик фрагментов для режима js."""
+    if settings.FRAGMENTS_MODE == 'js':
+        return FRAGMENT_LOADER
+    return ''
@@ -0,0 +1,64 @@
+import threading
+from urllib.parse import quote
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_script_prefix, reverse
+
+RFC3986_SUBDELIMS = "!$&'()*+,;="
+INT_PLACEHOLDER = 987654320
+STR_PLACEHOLDER = 'urlbuilderarg{}x'
+
+_lock = threading.Lock()
+_templates = {}
+"""(префикс, имя маршрута, типы аргументов) -> шаблон адреса."""
+
+
+def _compile(name, kinds):
+    """
+    Шаблон адреса: маршрут разрешается один раз с метками вместо
+    аргументов, метки заменяются на позиции для str.format.
+    """
+    placeholders = [
+        INT_PLACEHOLDER + index if kind is int
+        else STR_PLACEHOLDER.format(index)
+        for index, kind in enumerate(kinds)
+    ]
+    url = reverse(name, args=placeholders)
+    url = url.replace('{', '{{').replace('}', '}}')
+    for index, placeholder in enumerate(placeholders):
+        url = url.replace(str(placeholder), f'{{{index}}}')
+    return url
+
+
+def _quote(value):
+    if isinstance(value, int):
+        return str(value)
+    return quote(str(value), safe=RFC3986_SUBDELIMS + '/~:@')
+
+
+def build_url(name, *args):
+    """
+    Быстрый аналог reverse(name, args=args) для горячих маршрутов.
+    Шаблон адреса строится один раз на процесс для каждого сочетания
+    типов аргументов, дальше адрес получается подстановкой значений.
+    В отличие от reverse, значения не проверяются конвертерами
+    маршрута, поэтому передавать нужно id, slug и имена пользователей
+    из БД.
+    """
+    kinds = tuple(int if isinstance(arg, int) else str for arg in args)
+    key = (get_script_prefix(), name, kinds)
+    template = _templates.get(key)
+    if template is None:
+        template = _compile(name, kinds)
+        with _lock:
+            _templates[key] = template
+    return template.format(*map(_quote, args))
+
+
+@receiver(setting_changed)
+def clear_url_templates(setting, **kwargs):
+    """Сброс шаблонов при смене маршрутов (в тестах)."""
+    if setting == 'ROOT_URLCONF':
+        with _lock:
+            _templates.clear()
@@ -63,6 +63,29 @@ category_links = [
     ),
 ]
 
+fragment_links = [
+    path(
+        'header/',
+        views.HeaderFragmentView.as_view(),
+        name='fragment_header'
+    ),
+    path(
+        'posts/<int:post_id>/actions/',
+        views.PostActionsFragmentView.as_view(),
+        name='fragment_post_actions'
+    ),
+    path(
+        'posts/<int:post_id>/comment-form/',
+        views.CommentFormFragmentView.as_view(),
+        name='fragment_comment_form'
+    ),
+    path(
+        'posts/<int:post_id>/comments/<int:comment_id>/actions/',
+        views.CommentActionsFragmentView.as_view(),
+        name='fragment_comment_actions'
+    ),
+]
+
 urlpatterns = [
     path(
         '',
@@ -72,4 +95,5 @@ urlpatterns = [
     path('posts/', include(post_links)),
     path('profile/', include(profile_links)),
     path('category/', include(category_links)),
+    path('fragments/', include(fragment_links)),
 ]
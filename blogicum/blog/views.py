@@ -1,18 +1,44 @@
+import mimetypes
+import os
+from pathlib import Path
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.contrib.staticfiles import finders
 from django.db.models import Q
-from django.http import Http404, HttpResponseRedirect
-from django.shortcuts import get_object_or_404
+from django.http import (FileResponse, Http404, HttpResponseRedirect,
+                         StreamingHttpResponse)
+from django.template.loader import select_template
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                patch_vary_headers)
+from django.utils.http import http_date
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
-                                  UpdateView)
+                                  TemplateView, UpdateView, View)
 from django.views.generic.list import MultipleObjectMixin
 
-from core.constants import ELEMENTS_TO_SHOW
+from core.constants import (ELEMENTS_TO_SHOW, FEED_CACHE_TIMEOUT,
+                            MEDIA_CACHE_MAX_AGE, RESIZE_CACHE_MAX_AGE,
+                            RESIZE_SIZES, STATIC_CACHE_MAX_AGE)
 
+from .caching import (feed_cache_key, feed_generation, get_or_recompute,
+                      get_feed_generations, is_known_missing,
+                      remember_missing)
+from .counters import pending_views, record_view
 from .forms import CommentForm, PostForm
-from .models import Category, Comment, Post
+from .identity import get_identity_map
+from .images import get_cache_key, get_resized_image, get_source_path
+from .media import (file_response, get_file_etag, get_media_access,
+                    sendfile_response)
+from .models import AuthorStats, Category, Comment, Post
+from .pagination import CachedCountPaginator
+from .publication import publication_epoch
+from .reference import categories
+from .staticfiles import find_variant, is_hashed_name
+from .storage import is_content_addressed
+from .streaming import FeedStream
+from .urlbuilder import build_url
 
 """
 Так как в данном файле используются, в большинстве своем, базовые
@@ -55,28 +81,119 @@ class CommentMixin:
 
 
 class CachedObjectMixin:
-    """Миксин для кеширования данных."""
+    """
+    Миксин для загрузки объекта через карту идентичности запроса.
+    Повторные вызовы get_object (в test_func, в UpdateView/DeleteView)
+    не выполняют повторный запрос к БД.
+    Если задан missing_cache_name, то отсутствие объекта запоминается
+    в кеше, и повторные запросы несуществующих адресов не доходят до БД.
+    """
+
+    missing_cache_name = None
+
+    def get_object_queryset(self):
+        """QuerySet, из которого загружается объект страницы."""
+        return self.get_queryset()
+
+    def get_object_lookup(self):
+        """Условия поиска объекта по pk или slug из URL."""
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        if pk is not None:
+            return {'pk': pk}
+        return {self.get_slug_field(): self.kwargs.get(self.slug_url_kwarg)}
 
     def get_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_object_queryset()
+        lookup = self.get_object_lookup()
+        if self.missing_cache_name is None:
+            return get_identity_map(self.request).get_object_or_404(
+                queryset, **lookup
+            )
+        if is_known_missing(self.missing_cache_name, **lookup):
+            raise Http404()
+        try:
+            return get_identity_map(self.request).get_object_or_404(
+                queryset, **lookup
+            )
+        except Http404:
+            remember_missing(self.missing_cache_name, **lookup)
+            raise
+
+
+class FeedCacheMixin:
+    """
+    Миксин для лент: передаёт в шаблон ключ фрагмента со списком постов
+    и поколение ленты, поэтому при записи постов и комментариев фрагмент
+    перестраивается. Количество постов для пагинации тоже кешируется.
+    Поддерживает потоковую отдачу страницы (STREAMING_FEEDS).
+    """
+
+    feed_name = None
+    _feed_generation = None
+
+    def get_feed_name(self):
+        return self.feed_name
+
+    def get_feed_cache_parts(self):
+        """Дополнительные части ключа фрагмента."""
+        return ()
+
+    def get_feed_generation(self):
+        """Поколение ленты, запрашивается из кеша один раз за запрос."""
+        if self._feed_generation is None:
+            self._feed_generation = feed_generation(self.get_feed_name())
+        return self._feed_generation
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return CachedCountPaginator(
+            queryset,
+            per_page,
+            cache_key=feed_cache_key(
+                self.get_feed_name(), *self.get_feed_cache_parts(), 'count'
+            ),
+            timeout=FEED_CACHE_TIMEOUT,
+            generation=self.get_feed_generation(),
+            **kwargs
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['feed_cache_timeout'] = FEED_CACHE_TIMEOUT
+        context['feed_cache_key'] = feed_cache_key(
+            self.get_feed_name(), *self.get_feed_cache_parts()
+        )
+        context['feed_cache_generation'] = self.get_feed_generation()
+        return context
+
+    def render_to_response(self, context, **response_kwargs):
         """
-        При попытке оптимизации количества SQL запросов было замечено, что
-        основной запрос на загрузку данных дублировался. Данное решение помогло
-        избежать дублирования. (Не уверен, что данный подход на 100% оправдан)
+        При STREAMING_FEEDS страница отдаётся потоком: начало страницы
+        сразу, затем карточки постов по мере отрисовки.
         """
-        if not hasattr(self, '_cached_object'):
-            self._cached_object = super().get_object(queryset)
-        return self._cached_object
+        if not settings.STREAMING_FEEDS:
+            return super().render_to_response(context, **response_kwargs)
+        stream = FeedStream(
+            context['page_obj'], 'includes/post_list_item.html'
+        )
+        context['feed_stream'] = stream
+        html = select_template(self.get_template_names()).render(
+            context, self.request
+        )
+        return StreamingHttpResponse(
+            stream.stream(html), content_type='text/html; charset=utf-8'
+        )
 
 
-class Index(ListView):
+class Index(FeedCacheMixin, ListView):
     """CBV для отображения постов на главной странице."""
 
+    feed_name = 'index'
     model = Post
     queryset = (
         Post
         .published
-        .with_comment_count()
-        .select_related('author', 'category', 'location')
+        .for_feed()
     )
     paginate_by = ELEMENTS_TO_SHOW
 
@@ -90,13 +207,22 @@ class PostCreateView(PostMixin, LoginRequiredMixin, CreateView):
         form.instance.author = self.request.user
         return super().form_valid(form)
 
+    def get_success_url(self):
+        """После публикации автор попадает в свой профиль."""
+        return build_url('blog:profile', self.request.user.username)
+
 
 class PostDetailView(CachedObjectMixin, DetailView):
     """CBV для получения подробной информации о посте."""
 
     model = Post
-    queryset = Post.objects.select_related('author', 'location', 'category')
+    queryset = (
+        Post.objects
+        .select_related('author')
+        .with_cached_references()
+    )
     pk_url_kwarg = 'post_id'
+    missing_cache_name = 'post'
 
     def get_object(self, queryset=None):
         """
@@ -108,17 +234,44 @@ class PostDetailView(CachedObjectMixin, DetailView):
             raise Http404()
         return obj
 
+    def get(self, request, *args, **kwargs):
+        """Учёт просмотра в буфере без записи в БД."""
+        response = super().get(request, *args, **kwargs)
+        record_view(self.object.pk)
+        return response
+
+    def get_comments(self):
+        """
+        Комментарии поста из кеша с защитой от одновременного пересчёта:
+        после нового комментария к популярному посту список загружает
+        один запрос, а остальные получают предыдущую версию.
+        """
+        return get_or_recompute(
+            f'comments:{self.object.pk}',
+            lambda: list(self.object.comments.select_related('author')),
+            FEED_CACHE_TIMEOUT,
+            generation=get_feed_generations(f'comments:{self.object.pk}')
+        )
+
     def get_context_data(self, **kwargs):
         """Добавление имеющихся комментариев на страницу публикации."""
         context = dict(
             **super().get_context_data(**kwargs),
             form=CommentForm(),
-            comments=self.object.comments.select_related('author')
+            comments=self.get_comments(),
+            view_count=(
+                self.object.view_count + pending_views(self.object.pk) + 1
+            )
         )
         return context
 
 
-class PostUpdateView(PostMixin, OnlyAuthorMixin, UpdateView):
+class PostUpdateView(
+    CachedObjectMixin,
+    PostMixin,
+    OnlyAuthorMixin,
+    UpdateView
+):
     """CBV для редактирования поста."""
 
     template_name = 'blog/create.html'
@@ -163,26 +316,27 @@ class PostDeleteView(
     success_url = reverse_lazy('blog:index')
 
 
-class CategoryListView(CachedObjectMixin, DetailView, MultipleObjectMixin):
+class CategoryListView(FeedCacheMixin, DetailView, MultipleObjectMixin):
     """CBV для отображения странциы отдельной категории"""
 
-    slug_url_kwarg = 'post_id'
     model = Category
     context_object_name = 'category'
     paginate_by = ELEMENTS_TO_SHOW
 
     def get_object(self, queryset=None):
-        return get_object_or_404(
-            self.model,
-            slug=self.kwargs['category_slug'],
-            is_published=True)
+        """Категория берётся из кеша справочников, без запроса к БД."""
+        category = categories.get_by('slug', self.kwargs['category_slug'])
+        if category is None or not category.is_published:
+            raise Http404()
+        return category
+
+    def get_feed_name(self):
+        return f'category:{self.object.pk}'
 
     def get_queryset(self):
-        category = self.model.objects.get(slug=self.kwargs['category_slug'])
         return (
-            category.posts(manager='published')
-            .with_comment_count()
-            .select_related('author', 'category', 'location')
+            self.get_object().posts(manager='published')
+            .for_feed()
         )
 
     def get_context_data(self, **kwargs):
@@ -204,7 +358,14 @@ class CommentCreateView(CommentMixin, LoginRequiredMixin, CreateView):
     comment_post = None
 
     def dispatch(self, request, *args, **kwargs):
-        self.comment_post = get_object_or_404(Post, pk=kwargs['post_id'])
+        """
+        Проверка существования поста. Загружаются только поля, нужные
+        для инвалидации лент после сохранения комментария.
+        """
+        self.comment_post = get_identity_map(request).get_object_or_404(
+            Post.objects.only('id', 'author_id', 'category_id'),
+            pk=kwargs['post_id']
+        )
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
@@ -230,7 +391,7 @@ class CommentUpdateView(
     pk_url_kwarg = 'comment_id'
 
     def get_success_url(self):
-        post_id = self.object.comment_post.id
+        post_id = self.object.comment_post_id
         return reverse(
             'blog:post_detail',
             kwargs={'post_id': post_id})
@@ -240,21 +401,26 @@ class CommentUpdateView(
         return queryset.filter(author=self.request.user)
 
 
-class CommentDeleteView(CommentMixin, OnlyAuthorMixin, DeleteView):
+class CommentDeleteView(
+    CommentMixin,
+    CachedObjectMixin,
+    OnlyAuthorMixin,
+    DeleteView
+):
     """CBV для удаления комментария."""
 
     template_name = 'blog/comment_form.html'
     pk_url_kwarg = 'comment_id'
 
-    def get_object(self, queryset=None):
+    def get_object_lookup(self):
         """
-        Так как в запросе поступает два ключа, то производим переопределение
-        функции обработки. Возможно, что есть более лаконичное решение.
+        Так как в запросе поступает два ключа, то комментарий ищется
+        и по посту, и по своему id.
         """
-        post = self.kwargs['post_id']
-        comment = self.kwargs[self.pk_url_kwarg]
-        obj = get_object_or_404(Comment, comment_post=post, id=comment)
-        return obj
+        return {
+            'comment_post': self.kwargs['post_id'],
+            'pk': self.kwargs[self.pk_url_kwarg],
+        }
 
     def get_success_url(self):
         return (
@@ -264,16 +430,30 @@ class CommentDeleteView(CommentMixin, OnlyAuthorMixin, DeleteView):
         )
 
 
-class UserProfileView(DetailView, MultipleObjectMixin):
+class UserProfileView(
+    FeedCacheMixin,
+    CachedObjectMixin,
+    DetailView,
+    MultipleObjectMixin
+):
     """CBV дял отображения профиля пользователя."""
 
     model = User
+    queryset = User.objects.select_related('stats')
     template_name = 'blog/profile.html'
     context_object_name = 'profile'
     slug_field = 'username'
     slug_url_kwarg = 'username'
+    missing_cache_name = 'user'
     paginate_by = ELEMENTS_TO_SHOW
 
+    def get_feed_name(self):
+        return f'profile:{self.object.pk}'
+
+    def get_feed_cache_parts(self):
+        """Автор видит свои неопубликованные посты, поэтому ключ отдельный."""
+        return ('owner' if self.object == self.request.user else 'public',)
+
     def get_context_data(self, **kwargs):
         profile_user = self.object
         current_user = self.request.user
@@ -281,14 +461,13 @@ class UserProfileView(DetailView, MultipleObjectMixin):
         if profile_user != current_user:
             filter_condition &= Q(
                 is_published=True,
-                pub_date__lte=timezone.now())
+                pub_date__lte=publication_epoch())
         """Так как автор постов должен их видеть, то добавляем условие выше."""
         object_list = (
             Post
             .objects
             .filter(filter_condition)
-            .with_comment_count()
-            .select_related('author', 'category', 'location')
+            .for_feed()
             .ordered_by_pub_date()
         )
         """
@@ -297,6 +476,14 @@ class UserProfileView(DetailView, MultipleObjectMixin):
         тут может не подойти.
         """
         context = super().get_context_data(object_list=object_list, **kwargs)
+        try:
+            context['stats'] = profile_user.stats
+        except AuthorStats.DoesNotExist:
+            context['stats'] = AuthorStats(user=profile_user)
+        """
+        Статистика берётся из предрассчитанной строки, загруженной вместе
+        с пользователем, без дополнительных агрегирующих запросов.
+        """
         return context
 
 
@@ -317,3 +504,203 @@ class UserUpdateView(LoginRequiredMixin, UpdateView):
                 kwargs={'username': self.request.user.username}
             )
         )
+
+
+class FragmentView(TemplateView):
+    """
+    Базовый CBV для персональных фрагментов страниц (режимы esi и js).
+    Ответ зависит от пользователя и не должен попадать в общий кеш.
+    """
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        patch_cache_control(response, private=True, max_age=0)
+        return response
+
+
+class HeaderFragmentView(FragmentView):
+    """Фрагмент меню пользователя в шапке."""
+
+    template_name = 'includes/header_user.html'
+
+
+class PostActionsFragmentView(FragmentView):
+    """Фрагмент ссылок автора на редактирование и удаление поста."""
+
+    template_name = 'includes/post_actions.html'
+
+    def get_context_data(self, **kwargs):
+        return dict(
+            **super().get_context_data(**kwargs),
+            post=get_identity_map(self.request).get_object_or_404(
+                Post.objects.only('id', 'author_id'),
+                pk=self.kwargs['post_id']
+            )
+        )
+
+
+class CommentFormFragmentView(FragmentView):
+    """Фрагмент формы комментария."""
+
+    template_name = 'includes/comment_form.html'
+
+    def get_context_data(self, **kwargs):
+        """Для адреса формы достаточно id поста, запрос к БД не нужен."""
+        return dict(
+            **super().get_context_data(**kwargs),
+            post=Post(pk=self.kwargs['post_id']),
+            form=CommentForm()
+        )
+
+
+class CommentActionsFragmentView(FragmentView):
+    """Фрагмент ссылок автора на редактирование и удаление комментария."""
+
+    template_name = 'includes/comment_actions.html'
+
+    def get_context_data(self, **kwargs):
+        return dict(
+            **super().get_context_data(**kwargs),
+            post=Post(pk=self.kwargs['post_id']),
+            comment=get_identity_map(self.request).get_object_or_404(
+                Comment.objects.only('id', 'author_id'),
+                comment_post=self.kwargs['post_id'],
+                pk=self.kwargs['comment_id']
+            )
+        )
+
+
+class ResizedImageView(View):
+    """
+    Уменьшенная копия загруженного изображения одного из разрешённых
+    размеров. Доступ и кеширование в общих кешах такие же, как
+    у исходного файла.
+    ETag зависит от исходного файла, поэтому повторный запрос
+    с If-None-Match получает 304 без уменьшения и чтения копии.
+    Размер проверяется до условного ответа, иначе 304 получил бы
+    любой размер.
+    """
+
+    def get(self, request, width, height, path):
+        if (width, height) not in RESIZE_SIZES:
+            raise Http404()
+        source = get_source_path(path)
+        access = get_media_access(path, request.user)
+        if access is None:
+            raise Http404()
+        key = get_cache_key(source, width, height)
+        etag = f'"{key}"'
+        last_modified = int(source.stat().st_mtime)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            target = get_resized_image(source, width, height, key=key)
+            response = FileResponse(
+                open(target, 'rb'),
+                content_type=mimetypes.guess_type(source.name)[0]
+            )
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        if access == 'private':
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(
+                response, public=True, max_age=RESIZE_CACHE_MAX_AGE
+            )
+        return response
+
+
+class MediaView(View):
+    """
+    Отдача загруженных изображений с проверкой доступа: файлы
+    неопубликованных постов видит только автор. Если настроен
+    фронт-сервер (MEDIA_SENDFILE), то передачу файла выполняет он.
+    """
+
+    def get(self, request, path):
+        source = get_source_path(path)
+        access = get_media_access(path, request.user)
+        if access is None:
+            raise Http404()
+        stat = source.stat()
+        etag = get_file_etag(stat)
+        last_modified = int(stat.st_mtime)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            content_type = mimetypes.guess_type(source.name)[0]
+            if settings.MEDIA_SENDFILE:
+                response = sendfile_response(source, path, content_type)
+            else:
+                response = file_response(
+                    request,
+                    source,
+                    stat.st_size,
+                    content_type,
+                    etag,
+                    last_modified
+                )
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Accept-Ranges'] = 'bytes'
+        if access == 'private':
+            patch_cache_control(response, private=True, no_cache=True)
+        elif is_content_addressed(path):
+            patch_cache_control(
+                response, public=True, max_age=MEDIA_CACHE_MAX_AGE,
+                immutable=True
+            )
+        else:
+            patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+
+class StaticView(View):
+    """
+    Отдача статических файлов из STATIC_ROOT. Файлы с хешем в имени
+    не меняются и кешируются браузером навсегда, а сжатая копия,
+    созданная collectstatic, выбирается по Accept-Encoding.
+    Если collectstatic не выполнялся, файл ищется через finders.
+    """
+
+    def get(self, request, path):
+        try:
+            source = get_source_path(path, settings.STATIC_ROOT)
+        except Http404:
+            found = settings.DEBUG and finders.find(path)
+            if not found:
+                raise
+            source = Path(found)
+        variant, encoding = find_variant(
+            str(source), request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        stat = os.stat(variant)
+        etag = get_file_etag(stat)
+        last_modified = int(stat.st_mtime)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = FileResponse(
+                open(variant, 'rb'),
+                content_type=(
+                    mimetypes.guess_type(source.name)[0]
+                    or 'application/octet-stream'
+                ),
+                filename=source.name
+            )
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if is_hashed_name(path):
+            patch_cache_control(
+                response, public=True, max_age=STATIC_CACHE_MAX_AGE,
+                immutable=True
+            )
+        else:
+            patch_cache_control(response, public=True, no_cache=True)
+        return response
@@ -0,0 +1,169 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Max
+from django.db.models.functions import Coalesce
+from django.template import engines
+from django.template.loader import get_template
+from django.template.utils import get_app_template_dirs
+from django.test import Client
+from django.urls import get_resolver, reverse
+
+from core.constants import (ELEMENTS_TO_SHOW, WARMUP_PAGES, WARMUP_POSTS,
+                            WARMUP_PROFILES, WARMUP_WORKERS)
+
+from .models import AuthorStats, Post
+from .reference import categories
+
+logger = logging.getLogger(__name__)
+
+
+def get_warmup_client():
+    """
+    Клиент для внутренних анонимных запросов прогрева.
+    Использует первый разрешённый хост, чтобы запросы прошли
+    проверку ALLOWED_HOSTS.
+    """
+    host = next(
+        (host for host in settings.ALLOWED_HOSTS if host != '*'),
+        'localhost'
+    ).lstrip('.')
+    return Client(HTTP_HOST=host)
+
+
+def warm_url(url, client=None):
+    """Анонимный запрос страницы для заполнения кешей. Возвращает статус."""
+    client = client or get_warmup_client()
+    return client.get(url).status_code
+
+
+def _warm_url_in_thread(url):
+    """Прогрев из потока пула: соединения с БД потока закрываются."""
+    try:
+        return warm_url(url)
+    finally:
+        connections.close_all()
+
+
+def warm_urls(urls, workers=1):
+    """
+    Прогрев страниц. При workers > 1 запросы выполняются пулом
+    из не более чем workers потоков. Возвращает словарь адрес-статус.
+    """
+    urls = list(dict.fromkeys(urls))
+    if workers <= 1:
+        client = get_warmup_client()
+        return {url: warm_url(url, client) for url in urls}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(urls, executor.map(_warm_url_in_thread, urls)))
+
+
+def _template_names():
+    """Имена всех шаблонов из каталогов проекта и приложений."""
+    dirs = [
+        Path(directory)
+        for engine in engines.all()
+        for directory in engine.dirs
+    ]
+    dirs.extend(get_app_template_dirs('templates'))
+    for directory in dirs:
+        for path in sorted(directory.rglob('*.html')):
+            yield path.relative_to(directory).as_posix()
+
+
+def warm_machinery():
+    """
+    Загрузка шаблонов и заполнение URL-резолвера, чтобы первые запросы
+    не тратили время на компиляцию шаблонов и сборку маршрутов.
+    Возвращает количество загруженных шаблонов.
+    """
+    get_resolver().reverse_dict
+    loaded = 0
+    for name in dict.fromkeys(_template_names()):
+        try:
+            get_template(name)
+        except Exception:
+            logger.exception('Не удалось загрузить шаблон %s', name)
+        else:
+            loaded += 1
+    return loaded
+
+
+def collect_warmup_urls(
+    pages=WARMUP_PAGES,
+    posts=WARMUP_POSTS,
+    profiles=WARMUP_PROFILES
+):
+    """
+    Адреса горячих страниц: первые страницы главной ленты, первые
+    страницы опубликованных категорий, недавно активные посты
+    (по последнему комментарию или дате публикации) и профили.
+    """
+    index = reverse('blog:index')
+    pages = min(pages, -(-Post.published.count() // ELEMENTS_TO_SHOW))
+    urls = [index] + [f'{index}?page={page}' for page in range(2, pages + 1)]
+    urls.extend(
+        reverse('blog:category_posts', args=(category.slug,))
+        for category in categories.get_map().values()
+        if category.is_published
+    )
+    recent_posts = (
+        Post.published
+        .annotate(last_activity=Coalesce(
+            Max('comments__created_at'), 'pub_date'
+        ))
+        .order_by('-last_activity')
+        .values_list('pk', flat=True)[:posts]
+    )
+    urls.extend(
+        reverse('blog:post_detail', args=(pk,)) for pk in recent_posts
+    )
+    recent_profiles = (
+        AuthorStats.objects
+        .filter(last_activity_at__isnull=False)
+        .order_by('-last_activity_at')
+        .values_list('user__username', flat=True)[:profiles]
+    )
+    urls.extend(
+        reverse('blog:profile', args=(username,))
+        for username in recent_profiles
+    )
+    return urls
+
+
+def warm_caches(
+    pages=WARMUP_PAGES,
+    posts=WARMUP_POSTS,
+    profiles=WARMUP_PROFILES,
+    workers=WARMUP_WORKERS
+):
+    """
+    Полный прогрев: шаблоны, маршруты и горячие страницы.
+    Возвращает словарь адрес-статус.
+    """
+    warm_machinery()
+    return warm_urls(
+        collect_warmup_urls(pages, posts, profiles), workers=workers
+    )
+
+
+def start_warmup_thread():
+    """
+    Прогрев в фоновом потоке при запуске веб-сервера, чтобы не
+    задерживать начало обработки запросов.
+    """
+    def run():
+        try:
+            warm_caches()
+        except Exception:
+            logger.exception('Ошибка прогрева кешей при запуске')
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=run, name='warm-caches', daemon=True)
+    thread.start()
+    return thread
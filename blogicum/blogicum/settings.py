@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -25,14 +26,23 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'blog.middleware.CompressionMiddleware',
+    'blog.middleware.LazyLoadDetectionMiddleware',
+    'blog.middleware.FastPathSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'blog.middleware.FastPathAuthenticationMiddleware',
+    'blog.middleware.TemplateProfilerMiddleware',
+    'blog.middleware.FastPathMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+RESPONSE_COMPRESSION = {'br': 4, 'gzip': 6}
+"""
+Сжатие ответов: кодировка и уровень в порядке предпочтения. Brotli
+используется, только если установлен пакет brotli.
+"""
+
 ROOT_URLCONF = 'blogicum.urls'
 
 
@@ -54,6 +64,32 @@ TEMPLATES = [
     },
 ]
 
+FRAGMENTS_MODE = 'inline'
+"""
+Вывод персональных фрагментов страниц: 'inline', 'esi' или 'js'.
+"""
+
+STREAMING_FEEDS = False
+"""
+Потоковая отдача лент (главная, категории, профиль): начало страницы
+отправляется до отрисовки карточек постов.
+"""
+
+LAZY_LOAD_DETECTION = 'log' if DEBUG else None
+"""
+Поиск N+1 в запросах: None (выключен), 'log' (предупреждение
+в журнале blog.lazyload) или 'raise' (LazyLoadError). Срабатывает
+на загрузку связи или отложенного поля у объекта из выборки.
+"""
+
+TEMPLATE_PROFILING = DEBUG
+"""
+Профилирование шаблонов по запросу персонала (параметр
+profile_templates или заголовок X-Profile-Templates). Отчёт пишется
+в журнал blog.profiling. Включает обёртки над отрисовкой всех
+шаблонов, поэтому по умолчанию работает только при DEBUG.
+"""
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 DATABASES = {
@@ -63,6 +99,50 @@ DATABASES = {
     }
 }
 
+MEMCACHED_LOCATION = os.environ.get('MEMCACHED_LOCATION')
+"""
+Адрес memcached (например, 127.0.0.1:11211), общего для всех
+процессов. Если не задан, используется кеш в памяти процесса.
+"""
+
+if MEMCACHED_LOCATION:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': MEMCACHED_LOCATION,
+            'OPTIONS': {'no_delay': True},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'blogicum',
+        }
+    }
+"""
+Кеш должен быть в памяти: его читает каждый запрос, и кеш в БД
+превратил бы каждое попадание в запрос к ней. При нескольких
+процессах он должен быть ещё и общим: поколения лент меняют
+publish_scheduled и другие воркеры, а по версии пользователя
+сбрасываются его копии после смены пароля и выхода. Поэтому
+в развёртывании с несколькими воркерами задаётся MEMCACHED_LOCATION;
+с LocMemCache publish_scheduled не запускается, а пользователь
+не берётся из кеша.
+"""
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'blog.sessions',
+}
+
+SESSION_STORE = 'cached_db'
+
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STORE]
+
+SESSION_COOKIE_MAX_SIZE = 4000
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -90,6 +170,10 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'static_root'
+
+STATICFILES_STORAGE = 'blog.staticfiles.CompressedManifestStaticFilesStorage'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 STATICFILES_DIRS = [
@@ -102,8 +186,33 @@ LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = 'login'
 
+MEDIA_URL = '/media/'
+
 MEDIA_ROOT = BASE_DIR / 'media'
 
+MEDIA_SENDFILE = None
+"""
+Передача файлов фронт-серверу: None (отдаёт Django), 'nginx'
+(X-Accel-Redirect) или 'apache' (X-Sendfile).
+"""
+
+MEDIA_SENDFILE_PREFIX = '/protected-media/'
+"""
+Внутренний location nginx, указывающий на MEDIA_ROOT.
+"""
+
+DEFAULT_FILE_STORAGE = 'blog.storage.ContentAddressedStorage'
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+WARM_CACHES_ON_STARTUP = False
+"""
+Прогрев кешей в фоновом потоке при запуске WSGI-приложения.
+"""
+
+RESIZE_CACHE_ROOT = BASE_DIR / 'resize_cache'
+"""
+Каталог дискового кеша уменьшенных копий изображений.
+"""
@@ -1,12 +1,19 @@
-from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from blog.views import MediaView, ResizedImageView, StaticView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path(
+        'media/r/<int:width>x<int:height>/<path:path>',
+        ResizedImageView.as_view(),
+        name='resized_image',
+    ),
+    path('media/<path:path>', MediaView.as_view(), name='media'),
+    path('static/<path:path>', StaticView.as_view(), name='static'),
     path('', include('blog.urls')),
     path('pages/', include('pages.urls')),
     path('auth/', include('django.contrib.auth.urls')),
@@ -19,7 +26,7 @@ urlpatterns = [
         ),
         name='registration',
     ),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
 """
 Решение с вью внутри выглядит не совсем корректным, но отдельного
 приложения для авторизации нет, ввиду чего оно кажется допустимым.
@@ -1,7 +1,13 @@
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+if settings.WARM_CACHES_ON_STARTUP:
+    from blog.warmup import start_warmup_thread
+
+    start_warmup_thread()
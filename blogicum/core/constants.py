@@ -7,3 +7,190 @@ STANDART_MAX_LENGHT = 256
 """
 Максимальное количество символов.
 """
+STATS_BATCH_SIZE = 500
+"""
+Количество пользователей, пересчитываемых за одну транзакцию.
+"""
+VISIBILITY_BATCH_SIZE = 1000
+"""
+Количество постов, обновляемых за один запрос при смене
+доступности категории.
+"""
+PUBLICATION_EPOCH_SECONDS = 60
+"""
+Шаг "часов публикации" в секундах: публичные выборки сравнивают
+pub_date с началом текущего окна, а не с точным текущим временем.
+"""
+FEED_CACHE_TIMEOUT = 300
+"""
+Время жизни закешированных фрагментов лент в секундах.
+"""
+EXCERPT_WORDS = 10
+"""
+Количество слов в анонсе поста для карточек лент.
+"""
+EXCERPT_BATCH_SIZE = 500
+"""
+Количество постов, обрабатываемых за один запрос при заполнении анонсов.
+"""
+VIEW_COUNTER_FLUSH_THRESHOLD = 100
+"""
+Количество накопленных просмотров, после которого буфер сбрасывается в БД.
+"""
+VIEW_COUNTER_FLUSH_INTERVAL = 10
+"""
+Максимальное время в секундах между сбросами буфера просмотров.
+"""
+USER_CACHE_TIMEOUT = 60 * 60
+"""
+Время жизни закешированного пользователя в секундах.
+"""
+SESSION_SWEEP_BATCH_SIZE = 1000
+"""
+Количество истёкших сессий, удаляемых одним запросом.
+"""
+REFERENCE_CACHE_TTL = 300
+"""
+Время в секундах, после которого справочники (категории, локации)
+перечитываются из БД даже без инвалидации.
+"""
+NEGATIVE_CACHE_TIMEOUT = 60
+"""
+Время в секундах, в течение которого запоминается отсутствие объекта
+(поста, пользователя) и хранится отрисованная страница 404.
+"""
+CACHE_STALE_TIMEOUT = 60
+"""
+Время в секундах, в течение которого устаревшее значение хранится
+после истечения основного срока и отдаётся, пока другой процесс
+пересчитывает его.
+"""
+CACHE_LOCK_TIMEOUT = 10
+"""
+Максимальное время в секундах, на которое берётся блокировка пересчёта
+значения кеша.
+"""
+CACHE_LOCK_WAIT = 1
+"""
+Время в секундах, которое запрос ждёт результата чужого пересчёта,
+если устаревшего значения нет.
+"""
+CACHE_LOCK_POLL_INTERVAL = 0.02
+"""
+Интервал в секундах между проверками результата чужого пересчёта.
+"""
+CACHE_EARLY_EXPIRY_BETA = 1.0
+"""
+Коэффициент вероятностного досрочного пересчёта: чем он больше,
+тем раньше до истечения срока значение начинает пересчитываться.
+"""
+WARMUP_PAGES = 3
+"""
+Количество первых страниц главной ленты, прогреваемых после запуска.
+"""
+WARMUP_POSTS = 20
+"""
+Количество недавно активных постов, прогреваемых после запуска.
+"""
+WARMUP_PROFILES = 10
+"""
+Количество недавно активных профилей, прогреваемых после запуска.
+"""
+WARMUP_WORKERS = 4
+"""
+Количество потоков, одновременно выполняющих запросы прогрева.
+"""
+RESIZE_SIZES = frozenset({(160, 120), (320, 240), (640, 480), (1280, 960)})
+"""
+Разрешённые размеры (ширина, высота) для уменьшенных копий изображений.
+Произвольные размеры не принимаются, чтобы кеш не разрастался.
+"""
+RESIZE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+"""
+Максимальный суммарный размер кеша уменьшенных изображений в байтах.
+"""
+RESIZE_CACHE_SHARDS = 256
+"""
+Количество каталогов (шардов) кеша уменьшенных изображений. Лимит
+размера делится между шардами поровну и проверяется для каждого
+шарда отдельно.
+"""
+RESIZE_WORKERS = 2
+"""
+Количество процессов, выполняющих уменьшение изображений.
+"""
+RESIZE_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+"""
+Время в секундах, в течение которого браузеры и прокси могут
+хранить уменьшенное изображение.
+"""
+IMAGE_MIGRATION_BATCH_SIZE = 200
+"""
+Количество постов, изображения которых переносятся в
+контентно-адресуемое хранилище за одну транзакцию.
+"""
+MEDIA_GC_GRACE_PERIOD = 24 * 60 * 60
+"""
+Возраст файла в секундах, после которого файл без ссылок из БД
+считается потерянным. Защищает только что загруженные файлы, пост
+для которых ещё не сохранён.
+"""
+MEDIA_GC_BATCH_SIZE = 1000
+"""
+Количество файлов, наличие ссылок на которые проверяется одним запросом.
+"""
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+"""
+Время в секундах, в течение которого браузеры и прокси могут хранить
+изображения с именем по хешу содержимого (такой файл не меняется).
+"""
+MEDIA_CHUNK_SIZE = 64 * 1024
+"""
+Размер блока при отдаче части файла (Range) самим Django.
+"""
+STATIC_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+"""
+Время в секундах, в течение которого браузеры и прокси могут хранить
+статические файлы с хешем содержимого в имени.
+"""
+STATIC_COMPRESS_EXTENSIONS = frozenset({
+    '.css', '.js', '.svg', '.html', '.txt', '.json', '.map', '.ico',
+})
+"""
+Расширения статических файлов, для которых collectstatic создаёт
+сжатые копии .gz и .br. Изображения PNG/JPEG уже сжаты.
+"""
+STATIC_COMPRESS_MIN_SIZE = 256
+"""
+Минимальный размер файла в байтах, для которого создаются сжатые копии.
+"""
+COMPRESS_MIN_SIZE = 200
+"""
+Минимальный размер ответа в байтах, который сжимается middleware.
+Меньшие ответы после сжатия почти не уменьшаются.
+"""
+COMPRESSIBLE_CONTENT_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+"""
+Начала типов содержимого, которые сжимает middleware. Изображения
+и архивы уже сжаты, и повторное сжатие только тратит процессор.
+"""
+BREACH_PADDING_MAX = 100
+"""
+Максимальная длина случайного дополнения сжатого ответа, которое
+маскирует его размер от атаки BREACH.
+"""
+TEMPLATE_PROFILE_PARAM = 'profile_templates'
+"""
+Параметр запроса, включающий профилирование шаблонов для персонала.
+Значение flame заменяет ответ свёрнутыми стеками для флейм-графа.
+"""
+TEMPLATE_PROFILE_HEADER = 'HTTP_X_PROFILE_TEMPLATES'
+"""
+Заголовок X-Profile-Templates с тем же значением, что и параметр.
+"""
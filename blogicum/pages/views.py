@@ -1,6 +1,15 @@
+from django.core.cache import cache
+from django.http import HttpResponseNotFound
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.html import escape
 from django.views.generic import TemplateView
 
+from core.constants import NEGATIVE_CACHE_TIMEOUT
+
+NOT_FOUND_CACHE_KEY = 'page-404'
+NOT_FOUND_URL_PLACEHOLDER = '__not_found_url__'
+
 
 class AboutPage(TemplateView):
     template_name = 'pages/about.html'
@@ -11,7 +20,30 @@ class RulesPage(TemplateView):
 
 
 def page_not_found(request, exception):
-    return render(request, 'pages/404.html', status=404)
+    """
+    Страница 404. Для анонимных пользователей она одинакова с точностью
+    до адреса, поэтому отрисованный шаблон кешируется с заглушкой
+    вместо адреса, и поток запросов несуществующих страниц
+    не проходит через шаблонизатор.
+    """
+    if request.user.is_authenticated:
+        return render(
+            request,
+            'pages/404.html',
+            {'not_found_url': request.build_absolute_uri()},
+            status=404
+        )
+    content = cache.get(NOT_FOUND_CACHE_KEY)
+    if content is None:
+        content = render_to_string(
+            'pages/404.html',
+            {'not_found_url': NOT_FOUND_URL_PLACEHOLDER},
+            request
+        )
+        cache.set(NOT_FOUND_CACHE_KEY, content, NEGATIVE_CACHE_TIMEOUT)
+    return HttpResponseNotFound(content.replace(
+        NOT_FOUND_URL_PLACEHOLDER, escape(request.build_absolute_uri())
+    ))
 
 
 def server_error(request):
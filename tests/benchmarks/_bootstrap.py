@@ -0,0 +1,56 @@
+"""
+Окружение для бенчмарков, которые запускаются вне pytest:
+
+    python tests/benchmarks/bench_<имя>.py
+
+Создаётся тестовая БД в памяти, DEBUG и поиск N+1 выключены,
+чтобы замеры не включали отладочные накладные расходы. Статика
+отдаётся без манифеста: collectstatic для замеров не нужен.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path[:0] = [str(ROOT / 'blogicum'), str(ROOT)]
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (override_settings,  # noqa: E402
+                               setup_test_environment,
+                               teardown_test_environment)
+
+
+@contextmanager
+def benchmark_environment(**settings):
+    """Тестовая БД и настройки бенчмарка на время блока with."""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(
+            DEBUG=False,
+            LAZY_LOAD_DETECTION=None,
+            STATICFILES_STORAGE=(
+                'django.contrib.staticfiles.storage.StaticFilesStorage'
+            ),
+            **settings
+        ):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def timed(func, rounds):
+    """Среднее время одного вызова func в секундах."""
+    func()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds
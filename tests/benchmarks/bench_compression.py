@@ -0,0 +1,67 @@
+"""
+Цена сжатия ответов: время сжатия страницы и степень сжатия
+для gzip и brotli на разных уровнях. Brotli замеряется, только
+если установлен необязательный пакет brotli.
+"""
+from _bootstrap import benchmark_environment, timed
+
+from datetime import timedelta
+
+from django.test import Client
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+from blog.compression import (BrotliEncoder, GzipEncoder, brotli,
+                              compress_content)
+
+N_ROUNDS = 50
+
+LEVELS = {
+    'gzip': (GzipEncoder, (1, 6, 9)),
+    'br': (BrotliEncoder, (1, 4, 8, 11)),
+}
+
+
+def main():
+    with benchmark_environment():
+        posts = mixer.cycle(10).blend(
+            'blog.Post',
+            is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+            category__is_published=True,
+            location__is_published=True,
+        )
+        client = Client()
+        pages = [
+            client.get('/').content,
+            client.get(f'/posts/{posts[0].pk}/').content,
+        ]
+        size = sum(len(page) for page in pages)
+        print(f'Исходный размер страниц: {size} байт')
+        if brotli is None:
+            print('brotli не установлен, замеряется только gzip')
+        for encoding, (encoder_class, levels) in LEVELS.items():
+            if encoding == 'br' and brotli is None:
+                continue
+            for level in levels:
+                compressed = sum(
+                    len(compress_content(encoder_class(level), page))
+                    for page in pages
+                )
+                elapsed = timed(
+                    lambda: [
+                        compress_content(encoder_class(level), page)
+                        for page in pages
+                    ],
+                    N_ROUNDS
+                ) / len(pages)
+                print(
+                    f'{encoding}-{level}: {compressed} байт '
+                    f'({size / compressed:.1f}x, сэкономлено '
+                    f'{size - compressed} байт), '
+                    f'{elapsed * 1000:.3f} мс на страницу'
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Анонимные GET публичных страниц: запросов в секунду со стандартным
+стеком middleware и со стеком быстрого пути (сессия, пользователь
+и сообщения не загружаются). Стеки замеряются поочерёдно несколько
+раз, выводится медиана.
+"""
+from _bootstrap import benchmark_environment, timed
+
+from datetime import timedelta
+from statistics import median
+
+from django.test import Client, override_settings
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+N_REQUESTS = 100
+
+N_ROUNDS = 5
+
+STOCK_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+FAST_PATH_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.FastPathSessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'blog.middleware.FastPathAuthenticationMiddleware',
+    'blog.middleware.FastPathMessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+
+def requests_per_second(urls, middleware):
+    client = Client()
+
+    def request_all():
+        for url in urls:
+            assert client.get(url).status_code == 200
+
+    with override_settings(MIDDLEWARE=middleware):
+        return len(urls) / timed(request_all, N_REQUESTS)
+
+
+def main():
+    with benchmark_environment():
+        post = mixer.blend(
+            'blog.Post',
+            is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+            category__is_published=True,
+            location__is_published=True,
+        )
+        urls = ('/', f'/category/{post.category.slug}/', f'/posts/{post.id}/')
+        stacks = {
+            'стандартный стек': STOCK_MIDDLEWARE,
+            'быстрый путь': FAST_PATH_MIDDLEWARE,
+        }
+        results = {name: [] for name in stacks}
+        for _ in range(N_ROUNDS):
+            for name, middleware in stacks.items():
+                results[name].append(requests_per_second(urls, middleware))
+        for name, rates in results.items():
+            print(f'{name}: {median(rates):.0f} запросов/с')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Экономия на отрисовке форм: время bootstrap_form и закешированной
+разметки для пустых CommentForm и PostForm.
+"""
+from _bootstrap import benchmark_environment, timed
+
+from django_bootstrap5.forms import render_form
+from mixer.backend.django import mixer
+
+from blog.forms import CommentForm, PostForm
+from blog.templatetags.form_cache import cached_bootstrap_form
+
+N_RENDERS = 500
+
+
+def main():
+    with benchmark_environment():
+        mixer.cycle(5).blend('blog.Category', is_published=True)
+        mixer.cycle(5).blend('blog.Location', is_published=True)
+        for form_class in (CommentForm, PostForm):
+            plain = timed(lambda: render_form(form_class()), N_RENDERS)
+            cached = timed(
+                lambda: cached_bootstrap_form(form_class()), N_RENDERS
+            )
+            print(
+                f'{form_class.__name__}: bootstrap_form '
+                f'{plain * 10 ** 6:.0f} мкс, из кеша '
+                f'{cached * 10 ** 6:.0f} мкс ({plain / cached:.1f}x)'
+            )
+
+
+if __name__ == '__main__':
+    main()
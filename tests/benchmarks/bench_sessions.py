@@ -0,0 +1,37 @@
+"""
+Накладные расходы хранилищ сессий: время запроса главной страницы
+авторизованным пользователем и запросы к django_session для каждого
+движка из SESSION_ENGINES.
+"""
+from _bootstrap import benchmark_environment, timed
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import mixer
+
+N_REQUESTS = 200
+
+
+def main():
+    with benchmark_environment():
+        user = mixer.blend('auth.User')
+        for name, engine in settings.SESSION_ENGINES.items():
+            with override_settings(SESSION_ENGINE=engine):
+                client = Client()
+                client.force_login(user)
+                with CaptureQueriesContext(connection) as queries:
+                    elapsed = timed(lambda: client.get('/'), N_REQUESTS)
+            session_queries = sum(
+                'django_session' in query['sql'] for query in queries
+            )
+            print(
+                f'{name}: {elapsed * 1000:.2f} мс на запрос, '
+                f'{session_queries / (N_REQUESTS + 1):.1f} запросов '
+                f'к django_session'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Построение адресов горячих маршрутов блога: reverse() против
+build_url с шаблоном, скомпилированным один раз на процесс.
+"""
+from _bootstrap import timed
+
+from django.urls import reverse
+
+from blog.urlbuilder import build_url
+
+N_ROUNDS = 10000
+
+ROUTES = (
+    ('blog:post_detail', (42,)),
+    ('blog:profile', ('user.name+test@x',)),
+    ('blog:category_posts', ('some-slug',)),
+    ('blog:edit_comment', (42, 7)),
+)
+
+
+def main():
+    for name, args in ROUTES:
+        assert build_url(name, *args) == reverse(name, args=args)
+        by_reverse = timed(lambda: reverse(name, args=args), N_ROUNDS)
+        by_builder = timed(lambda: build_url(name, *args), N_ROUNDS)
+        print(
+            f'{name}: reverse {by_reverse * 10 ** 6:.2f} мкс, '
+            f'build_url {by_builder * 10 ** 6:.2f} мкс '
+            f'({by_reverse / by_builder:.1f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
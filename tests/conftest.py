@@ -32,6 +32,54 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def detect_lazy_loads():
+    with override_settings(LAZY_LOAD_DETECTION='raise'):
+        yield
+
+
+LOCAL_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests',
+    }
+}
+
+
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'tests_cache',
+    }
+}
+
+
+@pytest.fixture
+def shared_cache(settings, db):
+    from django.core.management import call_command
+
+    settings.CACHES = SHARED_CACHES
+    call_command('createcachetable', verbosity=0)
+
+
+@pytest.fixture(autouse=True)
+def local_cache():
+    with override_settings(CACHES=LOCAL_CACHES):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(monkeypatch, local_cache):
+    from blog import counters
+    from django.core.cache import cache
+
+    monkeypatch.setattr(counters, 'VIEW_COUNTER_FLUSH_THRESHOLD', 10 ** 6)
+    monkeypatch.setattr(counters, 'VIEW_COUNTER_FLUSH_INTERVAL', 10 ** 6)
+    cache.clear()
+    yield
+    counters._take_buffer()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
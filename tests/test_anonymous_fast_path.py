@@ -0,0 +1,41 @@
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.db.models import Model
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def public_urls(mixer: Mixer, user: Model):
+    post = mixer.blend(
+        'blog.Post', author=user, category__is_published=True
+    )
+    return ('/', f'/category/{post.category.slug}/', f'/posts/{post.id}/')
+
+
+def test_anonymous_response_is_cacheable(public_urls):
+    client = Client()
+    for url in public_urls:
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert 'Cookie' not in response.get('Vary', ''), (
+            "Убедитесь, что анонимный ответ публичной страницы не содержит"
+            " заголовка `Vary: Cookie`."
+        )
+        assert settings.SESSION_COOKIE_NAME not in response.cookies
+        assert not any(
+            'django_session' in query['sql']
+            or query['sql'].startswith('SELECT "auth_user"')
+            for query in queries
+        )
+
+
+def test_logged_in_requests_use_full_stack(public_urls, user_client):
+    response = user_client.get(public_urls[0])
+    assert 'Cookie' in response.get('Vary', '')
+
@@ -0,0 +1,42 @@
+import pytest
+from blog.models import AuthorStats, Comment, Post
+from blog.stats import recount_author_stats
+from django.db.models import Model
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_stats_follow_writes(mixer: Mixer, user: Model):
+    posts = mixer.cycle(2).blend(Post, author=user)
+    mixer.blend(Comment, author=user, comment_post=posts[0])
+    stats = AuthorStats.objects.get(user=user)
+    assert (stats.post_count, stats.comment_count) == (2, 1), (
+        "Убедитесь, что статистика автора обновляется при создании"
+        " публикаций и комментариев."
+    )
+    posts[0].delete()
+    stats.refresh_from_db()
+    assert (stats.post_count, stats.comment_count) == (1, 0), (
+        "Убедитесь, что статистика автора обновляется при удалении"
+        " публикации вместе с её комментариями."
+    )
+
+
+def test_recount_restores_stats(mixer: Mixer, user: Model):
+    post = mixer.blend(Post, author=user)
+    comment = mixer.blend(Comment, author=user, comment_post=post)
+    AuthorStats.objects.filter(user=user).update(
+        post_count=10, comment_count=10, last_activity_at=None
+    )
+    assert recount_author_stats() >= 1
+    stats = AuthorStats.objects.get(user=user)
+    assert (stats.post_count, stats.comment_count) == (1, 1)
+    assert stats.last_activity_at == max(post.created_at, comment.created_at)
+
+
+def test_profile_renders_stats(mixer: Mixer, user: Model, user_client):
+    mixer.cycle(3).blend(Post, author=user)
+    response = user_client.get(f'/profile/{user.username}/')
+    assert response.context['stats'].post_count == 3
+    assert 'Публикаций: 3' in response.content.decode()
@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.caching import GLOBAL_FEED, bump_generations, get_or_recompute
+
+N_WORKERS = 16
+QUERY_DELAY = 0.02
+
+
+def _run_concurrently(target):
+    barrier = threading.Barrier(N_WORKERS)
+    results = [None] * N_WORKERS
+
+    def worker(index):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [
+        threading.Thread(target=worker, args=(index,))
+        for index in range(N_WORKERS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _slow_compute(calls, value):
+    def compute():
+        calls.append(value)
+        time.sleep(0.1)
+        return value
+    return compute
+
+
+def test_concurrent_misses_are_coalesced():
+    calls = []
+    results = _run_concurrently(
+        lambda: get_or_recompute('stampede', _slow_compute(calls, 1), 60)
+    )
+    assert len(calls) == 1, (
+        "Убедитесь, что при одновременных промахах значение вычисляется"
+        " один раз."
+    )
+    assert results == [1] * N_WORKERS
+
+
+def test_stale_value_is_served_during_refresh():
+    get_or_recompute('stampede', lambda: 'old', 60, generation=1)
+    calls = []
+    results = _run_concurrently(
+        lambda: get_or_recompute(
+            'stampede', _slow_compute(calls, 'new'), 60, generation=2
+        )
+    )
+    assert calls == ['new']
+    assert set(results) <= {'old', 'new'} and results.count('new') == 1, (
+        "Убедитесь, что во время пересчёта остальные запросы получают"
+        " устаревшее значение."
+    )
+    assert get_or_recompute('stampede', lambda: 'other', 60, 2) == 'new'
+
+
+def _slow_queries(execute, sql, params, many, context):
+    time.sleep(QUERY_DELAY)
+    return execute(sql, params, many, context)
+
+
+def _burst(url):
+    """Одновременные запросы страницы, возвращает число запросов к БД."""
+    def request():
+        with connection.execute_wrapper(_slow_queries):
+            with CaptureQueriesContext(connection) as queries:
+                assert Client().get(url).status_code == 200
+        connection.close()
+        return len(queries)
+
+    return sum(_run_concurrently(request))
+
+
+@pytest.mark.django_db(transaction=True)
+def test_feed_queries_stay_flat_on_invalidation(mixer: Mixer, user: Model):
+    mixer.cycle(5).blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category__is_published=True,
+        location__is_published=True,
+    )
+    Client().get('/')
+    warm_queries = _burst('/')
+    bump_generations(GLOBAL_FEED)
+    burst_queries = _burst('/')
+    assert burst_queries <= warm_queries + 5, (
+        "Убедитесь, что после инвалидации ленту пересчитывает один запрос,"
+        " а остальные получают устаревшую версию."
+    )
@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def use_shared_cache(shared_cache):
+    pass
+
+
+def _user_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [
+        query['sql'] for query in queries
+        if query['sql'].startswith('SELECT "auth_user"')
+    ]
+
+
+def test_steady_state_has_no_auth_queries(user: Model, user_client):
+    assert _user_queries(user_client, '/')
+    assert not _user_queries(user_client, '/'), (
+        "Убедитесь, что пользователь берётся из кеша и не загружается"
+        " из БД при каждом запросе."
+    )
+
+
+def test_profile_update_invalidates_user(user: Model, user_client):
+    user_client.get('/')
+    user.first_name = 'Обновлённое'
+    user.save()
+    assert _user_queries(user_client, '/'), (
+        "Убедитесь, что изменение пользователя сбрасывает его копию в кеше."
+    )
+
+
+def test_password_change_logs_out_other_sessions(user: Model, user_client):
+    user_client.get('/')
+    user.set_password('new-secret-password')
+    user.save()
+    response = user_client.get('/posts/create/')
+    assert response.status_code == 302, (
+        "Убедитесь, что после смены пароля старая сессия недействительна."
+    )
+
+
+def test_deactivated_user_is_logged_out(user: Model, user_client):
+    user_client.get('/')
+    user.is_active = False
+    user.save()
+    response = user_client.get('/posts/create/')
+    assert response.status_code == 302, (
+        "Убедитесь, что деактивированный пользователь теряет доступ."
+    )
+
+
+def test_local_cache_is_not_trusted(user: Model, user_client, settings):
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+    user_client.get('/')
+    assert _user_queries(user_client, '/'), (
+        "Убедитесь, что с кешем, локальным для процесса, пользователь "
+        "загружается из БД."
+    )
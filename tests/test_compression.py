@@ -0,0 +1,99 @@
+import gzip
+import zlib
+
+import pytest
+from django.db.models import Model
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from mixer.backend.django import Mixer
+
+from blog.compression import (BrotliEncoder, GzipEncoder, brotli,
+                              compress_content)
+from blog.middleware import CompressionMiddleware
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer: Mixer, user: Model):
+    return mixer.cycle(10).blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category__is_published=True,
+    )
+
+
+def compress(response, accept_encoding='gzip', **meta):
+    request = RequestFactory().get(
+        '/', HTTP_ACCEPT_ENCODING=accept_encoding, **meta
+    )
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+def test_html_page_is_compressed(posts, client):
+    plain = client.get('/').content
+    response = client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+    assert response['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response['Vary']
+    assert gzip.decompress(response.content) == plain
+    assert len(response.content) * 3 < len(plain)
+
+
+def test_breach_padding_varies_length():
+    content = b'<p>csrf</p>' * 100
+    lengths = {
+        len(compress(HttpResponse(content)).content) for _ in range(20)
+    }
+    assert len(lengths) > 1, (
+        "Убедитесь, что длина сжатого ответа дополняется случайным"
+        " образом."
+    )
+
+
+def test_streaming_response_is_compressed_by_chunks():
+    chunks = [b'<li>item</li>' * 50 for _ in range(5)]
+    response = compress(StreamingHttpResponse(iter(chunks)))
+    assert response['Content-Encoding'] == 'gzip'
+    parts = list(response.streaming_content)
+    assert len(parts) == len(chunks) + 1, (
+        "Убедитесь, что потоковый ответ сжимается по частям."
+    )
+    assert zlib.decompress(b''.join(parts), 31) == b''.join(chunks)
+
+
+@pytest.mark.parametrize('response, meta', [
+    (HttpResponse(b'x' * 1000, content_type='image/png'), {}),
+    (HttpResponse(b'short'), {}),
+    (HttpResponse(b'x' * 1000, headers={'Content-Encoding': 'br'}), {}),
+    (HttpResponse(b'x' * 1000), {'CSRF_COOKIE_USED': True,
+                                 'HTTP_SEC_FETCH_SITE': 'cross-site'}),
+])
+def test_skipped_responses(response, meta):
+    content = response.content
+    assert compress(response, **meta).content == content, (
+        "Убедитесь, что сжатые, несжимаемые и короткие ответы, а также"
+        " межсайтовые ответы с CSRF-токеном не сжимаются."
+    )
+
+
+@pytest.mark.skipif(brotli is None, reason='brotli не установлен')
+def test_brotli_is_preferred(posts, client):
+    response = client.get('/', HTTP_ACCEPT_ENCODING='gzip, br')
+    assert response['Content-Encoding'] == 'br'
+
+
+def test_all_levels_compress_pages(posts, client):
+    pages = [client.get('/').content, client.get(
+        f'/posts/{posts[0].pk}/'
+    ).content]
+    encoders = [(GzipEncoder, level) for level in (1, 6, 9)]
+    if brotli is not None:
+        encoders += [(BrotliEncoder, level) for level in (4, 11)]
+    size = sum(len(page) for page in pages)
+    for encoder_class, level in encoders:
+        compressed = sum(
+            len(compress_content(encoder_class(level), page))
+            for page in pages
+        )
+        assert compressed < size
@@ -0,0 +1,62 @@
+from io import StringIO
+
+import pytest
+from blog.models import Post
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+LONG_TEXT = ' '.join(f'слово{i}' for i in range(100))
+
+
+def test_excerpt_saved_and_backfilled(mixer: Mixer, user: Model):
+    post = mixer.blend(Post, author=user, text=LONG_TEXT)
+    assert post.excerpt == Post.make_excerpt(LONG_TEXT)
+    assert len(post.excerpt.split()) == 11
+    Post.objects.update(excerpt='')
+    call_command('backfill_excerpts', stdout=StringIO())
+    post.refresh_from_db()
+    assert post.excerpt == Post.make_excerpt(LONG_TEXT)
+
+
+def test_feed_defers_full_text(mixer: Mixer, user: Model, client):
+    mixer.blend(Post, author=user, text=LONG_TEXT)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/')
+    content = response.content.decode()
+    assert Post.make_excerpt(LONG_TEXT) in content
+    assert 'слово99' not in content
+    feed_sql = [q['sql'] for q in queries if 'FROM "blog_post"' in q['sql']]
+    assert feed_sql and not any(
+        '"blog_post"."text"' in sql for sql in feed_sql
+    ), "Убедитесь, что ленты не загружают полный текст постов."
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_fills_excerpt():
+    before = [('blog', '0015_post_is_visible')]
+    executor = MigrationExecutor(connection)
+    latest = executor.loader.graph.leaf_nodes('blog')
+    executor.migrate(before)
+    apps = executor.loader.project_state(before).apps
+    author = apps.get_model('auth', 'User').objects.create(username='old')
+    category = apps.get_model('blog', 'Category').objects.create(
+        title='Категория', description='Описание', slug='old'
+    )
+    post = apps.get_model('blog', 'Post').objects.create(
+        title='Старый пост',
+        text=LONG_TEXT,
+        pub_date='2024-01-01T00:00:00Z',
+        author=author,
+        category=category,
+    )
+    executor = MigrationExecutor(connection)
+    executor.migrate(latest)
+    assert Post.objects.get(pk=post.pk).excerpt == Post.make_excerpt(
+        LONG_TEXT
+    ), "Убедитесь, что миграция заполняет анонсы существующих постов."
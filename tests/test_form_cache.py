@@ -0,0 +1,29 @@
+import pytest
+from blog.forms import CommentForm, PostForm
+from blog.templatetags.form_cache import cached_bootstrap_form, is_pristine
+from django.db.models import Model
+from django_bootstrap5.forms import render_form
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_cached_markup_matches_bootstrap():
+    for form_class in (CommentForm, PostForm):
+        assert cached_bootstrap_form(form_class()) == render_form(
+            form_class()
+        )
+
+
+def test_bound_forms_are_not_cached(mixer: Mixer, user: Model):
+    post = mixer.blend('blog.Post', author=user)
+    assert is_pristine(PostForm())
+    assert not is_pristine(PostForm(instance=post))
+    assert not is_pristine(CommentForm(data={'text': ''}))
+
+
+def test_new_category_rebuilds_post_form(mixer: Mixer):
+    cached_bootstrap_form(PostForm())
+    category = mixer.blend('blog.Category', title='Свежая категория')
+    assert category.title in cached_bootstrap_form(PostForm())
+
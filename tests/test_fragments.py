@@ -0,0 +1,48 @@
+import re
+
+import pytest
+from django.db.models import Model
+from django.test import override_settings
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(mixer: Mixer, user: Model):
+    return mixer.blend(
+        'blog.Post', author=user, category__is_published=True
+    )
+
+
+@override_settings(FRAGMENTS_MODE='esi')
+def test_page_shell_is_shared(post, user_client, another_user_client):
+    url = f'/posts/{post.id}/'
+    author_response = user_client.get(url)
+    assert 'Cookie' not in author_response.get('Vary', ''), (
+        "Убедитесь, что в режиме esi страница поста не зависит"
+        " от пользователя."
+    )
+    content = author_response.content.decode()
+    assert f'<esi:include src="/fragments/posts/{post.id}/actions/" />' in (
+        content
+    )
+    assert '/fragments/header/' in content
+    assert f'/posts/{post.id}/edit/' not in content
+    strip_counter = re.compile(r'Просмотров: \d+')
+    assert strip_counter.sub('', content) == strip_counter.sub(
+        '', another_user_client.get(url).content.decode()
+    )
+
+
+def test_fragments_are_personal(post, user_client, another_user_client):
+    url = f'/fragments/posts/{post.id}/actions/'
+    author_response = user_client.get(url)
+    assert f'/posts/{post.id}/edit/' in author_response.content.decode()
+    assert 'private' in author_response['Cache-Control']
+    assert f'/posts/{post.id}/edit/' not in (
+        another_user_client.get(url).content.decode()
+    )
+    assert 'csrfmiddlewaretoken' in user_client.get(
+        f'/fragments/posts/{post.id}/comment-form/'
+    ).content.decode()
@@ -0,0 +1,64 @@
+import os
+import time
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Model
+from django.test import override_settings
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def media(tmp_path, mixer: Mixer, user: Model):
+    images = tmp_path / 'media' / 'posts_images'
+    (images / 'ab' / 'cd').mkdir(parents=True)
+    old = time.time() - 2 * 24 * 60 * 60
+    for name in ('used.jpg', 'orphan.jpg', 'ab/cd/orphan.jpg'):
+        (images / name).write_bytes(b'x' * 100)
+        os.utime(images / name, (old, old))
+    (images / 'fresh.jpg').write_bytes(b'x' * 100)
+    post = mixer.blend('blog.Post', author=user)
+    Post.objects.filter(pk=post.pk).update(image='posts_images/used.jpg')
+    with override_settings(MEDIA_ROOT=tmp_path / 'media'):
+        yield images
+
+
+def test_gc_media_removes_old_orphans(media, capsys):
+    call_command('gc_media', batch_size=2)
+    assert sorted(
+        path.relative_to(media).as_posix() for path in media.rglob('*')
+    ) == ['fresh.jpg', 'used.jpg'], (
+        "Убедитесь, что удаляются только старые файлы без ссылок из БД,"
+        " а опустевшие каталоги шардов удаляются."
+    )
+    assert '200 байт' in capsys.readouterr().out
+
+
+def test_gc_media_quarantine(media, tmp_path):
+    call_command('gc_media', quarantine=tmp_path / 'quarantine')
+    assert (tmp_path / 'quarantine' / 'posts_images' / 'ab' / 'cd'
+            / 'orphan.jpg').is_file()
+    assert not (media / 'orphan.jpg').exists()
+
+
+def test_gc_media_dry_run(media):
+    call_command('gc_media', dry_run=True)
+    assert (media / 'orphan.jpg').is_file()
+
+
+def test_gc_media_skips_reuploaded_file(media, monkeypatch):
+    def reupload(queryset, *args, **kwargs):
+        os.utime(media / 'orphan.jpg')
+        return values_list(queryset, *args, **kwargs)
+
+    values_list = type(Post.objects.all()).values_list
+    monkeypatch.setattr(type(Post.objects.all()), 'values_list', reupload)
+    call_command('gc_media')
+    assert (media / 'orphan.jpg').is_file(), (
+        "Убедитесь, что файл, загруженный повторно во время сборки,"
+        " не удаляется."
+    )
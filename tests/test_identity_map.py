@@ -0,0 +1,74 @@
+import re
+
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+ROW_LOOKUP = re.compile(r'^SELECT .* FROM "(blog_\w+|auth_user)" .*WHERE')
+
+
+@pytest.fixture
+def post(mixer: Mixer, user: Model):
+    return mixer.blend(
+        'blog.Post', author=user, category__is_published=True
+    )
+
+
+@pytest.fixture
+def comment(mixer: Mixer, user: Model, post):
+    return mixer.blend('blog.Comment', author=user, comment_post=post)
+
+
+def _row_lookups(client, method, url, data=None):
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(client, method)(url, data or {})
+    assert response.status_code in (200, 302), url
+    lookups = {}
+    for query in queries:
+        match = ROW_LOOKUP.match(query['sql'])
+        if match:
+            lookups[match.group(1)] = lookups.get(match.group(1), 0) + 1
+    return lookups
+
+
+@pytest.mark.parametrize(
+    ('method', 'url', 'data', 'table'),
+    [
+        ('get', '/posts/{post.id}/edit/', None, 'blog_post'),
+        ('post', '/posts/{post.id}/edit/', {
+            'title': 'Новый заголовок',
+            'text': 'Новый текст',
+            'pub_date': '2020-01-01',
+            'category': '{post.category_id}',
+        }, 'blog_post'),
+        ('get', '/posts/{post.id}/delete/', None, 'blog_post'),
+        ('post', '/posts/{post.id}/delete/', None, 'blog_post'),
+        ('post', '/posts/{post.id}/comment/', {'text': 'Текст'},
+         'blog_post'),
+        ('get', '/posts/{post.id}/edit_comment/{comment.id}', None,
+         'blog_comment'),
+        ('post', '/posts/{post.id}/edit_comment/{comment.id}',
+         {'text': 'Правка'}, 'blog_comment'),
+        ('get', '/posts/{post.id}/delete_comment/{comment.id}', None,
+         'blog_comment'),
+        ('post', '/posts/{post.id}/delete_comment/{comment.id}', None,
+         'blog_comment'),
+    ],
+)
+def test_write_views_fetch_rows_once(
+        user_client, post, comment, method, url, data, table
+):
+    url = url.format(post=post, comment=comment)
+    if data:
+        data = {
+            key: value.format(post=post) for key, value in data.items()
+        }
+    lookups = _row_lookups(user_client, method, url, data)
+    assert lookups.get(table, 0) == 1, (
+        f"Убедитесь, что при запросе {method.upper()} {url} строка"
+        f" `{table}` загружается из БД один раз, а не {lookups.get(table)}."
+    )
@@ -0,0 +1,123 @@
+import io
+import os
+import time
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db.models import Model
+from django.test import override_settings
+from mixer.backend.django import Mixer
+from PIL import Image
+
+from blog.models import Post
+from blog.storage import is_content_addressed
+from core.constants import MEDIA_GC_GRACE_PERIOD
+
+pytestmark = [pytest.mark.django_db]
+
+
+def make_image(color='red'):
+    content = io.BytesIO()
+    Image.new('RGB', (10, 10), color).save(content, format='JPEG')
+    return content.getvalue()
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield tmp_path
+
+
+@pytest.fixture
+def make_post(mixer: Mixer, user: Model):
+    def make_post(**kwargs):
+        return mixer.blend(
+            'blog.Post', author=user, category__is_published=True, **kwargs
+        )
+    return make_post
+
+
+def make_old(path):
+    old = time.time() - MEDIA_GC_GRACE_PERIOD - 60
+    os.utime(path, (old, old))
+
+
+def test_identical_uploads_share_file(
+    media_root, make_post, django_capture_on_commit_callbacks
+):
+    first = make_post(image=SimpleUploadedFile('a.jpg', make_image()))
+    second = make_post(image=SimpleUploadedFile('b.jpg', make_image()))
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые загрузки сохраняются в один файл."
+    )
+    assert is_content_addressed(first.image.name)
+    assert first.image.name.startswith('posts_images/')
+    path = media_root / first.image.name
+    assert path.is_file()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert path.is_file(), (
+        "Убедитесь, что файл, на который ссылается другой пост,"
+        " не удаляется."
+    )
+    make_old(path)
+    with django_capture_on_commit_callbacks(execute=True):
+        second.image = SimpleUploadedFile('c.jpg', make_image('blue'))
+        second.save()
+    assert not path.exists(), (
+        "Убедитесь, что файл без ссылок удаляется."
+    )
+
+
+def test_duplicate_upload_refreshes_mtime(
+    media_root, make_post, django_capture_on_commit_callbacks
+):
+    first = make_post(image=SimpleUploadedFile('a.jpg', make_image()))
+    path = media_root / first.image.name
+    make_old(path)
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert not path.exists()
+
+    second = make_post(image=SimpleUploadedFile('b.jpg', make_image()))
+    make_old(path)
+    Post.objects.filter(pk=second.pk).update(image='')
+    third = make_post(image=SimpleUploadedFile('c.jpg', make_image()))
+    assert time.time() - path.stat().st_mtime < 60, (
+        "Убедитесь, что повторная загрузка обновляет время изменения файла."
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        third.delete()
+    assert path.is_file(), (
+        "Убедитесь, что недавно загруженный файл не удаляется"
+        " до окончания периода ожидания."
+    )
+
+
+def test_migrate_images(
+    media_root, make_post, django_capture_on_commit_callbacks
+):
+    legacy_dir = media_root / 'posts_images'
+    legacy_dir.mkdir()
+    (legacy_dir / 'one.jpg').write_bytes(make_image())
+    (legacy_dir / 'two.jpg').write_bytes(make_image())
+    posts = [make_post(), make_post()]
+    for post, name in zip(posts, ('one.jpg', 'two.jpg')):
+        Post.objects.filter(pk=post.pk).update(image=f'posts_images/{name}')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command('migrate_images', batch_size=1)
+
+    names = set(
+        Post.objects
+        .filter(pk__in=[post.pk for post in posts])
+        .values_list('image', flat=True)
+    )
+    assert len(names) == 1 and is_content_addressed(names.pop()), (
+        "Убедитесь, что одинаковые файлы переносятся в один файл"
+        " хранилища."
+    )
+    assert not (legacy_dir / 'one.jpg').exists()
+    assert not (legacy_dir / 'two.jpg').exists()
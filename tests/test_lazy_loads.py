@@ -0,0 +1,79 @@
+import logging
+
+import pytest
+from django.db.models import Model
+from django.template import Context, Template
+from django.test import override_settings
+from mixer.backend.django import Mixer
+
+from blog.lazyload import LazyLoadError, start_detection, stop_detection
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer: Mixer, user: Model):
+    return mixer.cycle(3).blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category__is_published=True,
+    )
+
+
+@pytest.fixture
+def detection():
+    token = start_detection()
+    yield
+    stop_detection(token)
+
+
+def test_foreign_key_in_loop_raises(posts, detection):
+    with pytest.raises(LazyLoadError, match=r'Post\.author'):
+        for post in Post.objects.all():
+            post.author.username
+
+
+def test_deferred_field_in_loop_raises(posts, detection):
+    with pytest.raises(LazyLoadError, match=r'Post\.text'):
+        for post in Post.objects.only('title'):
+            post.text
+
+
+def test_template_line_is_reported(posts, detection):
+    template = Template(
+        '{% for post in posts %}\n{{ post.author.username }}{% endfor %}'
+    )
+    with pytest.raises(LazyLoadError, match=r'шаблон <unknown source>:2'):
+        template.render(Context({'posts': Post.objects.all()}))
+
+
+def test_loaded_relations_pass(posts, detection):
+    for post in Post.objects.select_related('author'):
+        post.author.username
+    post = Post.objects.get(pk=posts[0].pk)
+    assert post.author.username
+    with override_settings(LAZY_LOAD_DETECTION='log'):
+        for post in Post.objects.only('title'):
+            post.title
+
+
+def test_log_mode(posts, detection, caplog):
+    with override_settings(LAZY_LOAD_DETECTION='log'):
+        with caplog.at_level(logging.WARNING, logger='blog.lazyload'):
+            for post in Post.objects.all():
+                post.author.username
+    records = [
+        record for record in caplog.records
+        if record.name == 'blog.lazyload'
+    ]
+    assert len(records) == len(posts), (
+        'Убедитесь, что в режиме log каждая ленивая загрузка '
+        'пишется в журнал.'
+    )
+
+
+def test_detection_is_off_outside_requests(posts):
+    for post in Post.objects.all():
+        post.author.username
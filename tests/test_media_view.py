@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+import pytest
+from django.db.models import Model
+from django.test import override_settings
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media(tmp_path, mixer: Mixer, user: Model):
+    images = tmp_path / 'posts_images'
+    images.mkdir()
+    for name in ('public.jpg', 'draft.jpg', 'orphan.jpg'):
+        (images / name).write_bytes(CONTENT)
+    for name, is_published in (('public', True), ('draft', False)):
+        post = mixer.blend(
+            'blog.Post',
+            author=user,
+            is_published=is_published,
+            pub_date=timezone.now() - timedelta(days=1),
+            category__is_published=True,
+        )
+        Post.objects.filter(pk=post.pk).update(
+            image=f'posts_images/{name}.jpg'
+        )
+    with override_settings(MEDIA_ROOT=tmp_path, MEDIA_SENDFILE=None):
+        yield tmp_path
+
+
+def test_media_access(media, client, user_client):
+    response = client.get('/media/posts_images/public.jpg')
+    assert response.status_code == 200
+    assert b''.join(response.streaming_content) == CONTENT
+    assert 'public' in response['Cache-Control']
+    assert client.get('/media/posts_images/draft.jpg').status_code == 404, (
+        "Убедитесь, что изображение неопубликованного поста недоступно"
+        " другим пользователям."
+    )
+    response = user_client.get('/media/posts_images/draft.jpg')
+    assert response.status_code == 200
+    assert 'private' in response['Cache-Control']
+    assert client.get('/media/posts_images/orphan.jpg').status_code == 404
+
+
+def test_media_conditional_and_range(media, client):
+    url = '/media/posts_images/public.jpg'
+    response = client.get(url)
+    etag = response['ETag']
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    response = client.get(url, HTTP_RANGE='bytes=10-19')
+    assert response.status_code == 206
+    assert response['Content-Range'] == f'bytes 10-19/{len(CONTENT)}'
+    assert b''.join(response.streaming_content) == CONTENT[10:20]
+    response = client.get(url, HTTP_RANGE='bytes=-5')
+    assert b''.join(response.streaming_content) == CONTENT[-5:]
+    response = client.get(url, HTTP_RANGE='bytes=5000-')
+    assert response.status_code == 416
+    response = client.get(
+        url, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == 200, (
+        "Убедитесь, что при несовпадении If-Range отдаётся весь файл."
+    )
+
+
+@pytest.mark.parametrize('backend, header, value', [
+    ('nginx', 'X-Accel-Redirect', '/protected-media/posts_images/public.jpg'),
+    ('apache', 'X-Sendfile', 'posts_images/public.jpg'),
+])
+def test_media_sendfile(media, client, backend, header, value):
+    with override_settings(MEDIA_SENDFILE=backend):
+        response = client.get('/media/posts_images/public.jpg')
+    assert response.status_code == 200
+    assert response[header].endswith(value)
+    assert response.content == b'', (
+        "Убедитесь, что при настроенном фронт-сервере файл не передаётся"
+        " через Django."
+    )
+
+
+def test_image_lookup_uses_index():
+    plan = Post.objects.filter(image='posts_images/a.jpg').explain()
+    assert 'INDEX' in plan, (
+        "Убедитесь, что поиск поста по изображению использует индекс."
+    )
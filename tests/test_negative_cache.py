@@ -0,0 +1,45 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize('url', ['/posts/999999/', '/profile/no-such-user/'])
+def test_missing_lookup_is_cached(client, url):
+    assert client.get(url).status_code == 404
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 404
+    assert not queries, (
+        "Убедитесь, что повторный запрос несуществующего объекта"
+        " не обращается к БД."
+    )
+    assert url in response.content.decode(), (
+        "Убедитесь, что закешированная страница 404 содержит"
+        " запрошенный адрес."
+    )
+
+
+def test_created_objects_are_not_hidden(mixer: Mixer, user: Model, client):
+    assert client.get('/profile/late-user/').status_code == 404
+    mixer.blend('auth.User', username='late-user')
+    assert client.get('/profile/late-user/').status_code == 200
+
+    post_id = mixer.blend(
+        'blog.Post',
+        author=user,
+        category__is_published=True,
+    ).pk + 1
+    assert client.get(f'/posts/{post_id}/').status_code == 404
+    mixer.blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category__is_published=True,
+    )
+    assert client.get(f'/posts/{post_id}/').status_code == 200, (
+        "Убедитесь, что созданный пост не остаётся в кеше отсутствующих."
+    )
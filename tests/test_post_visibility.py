@@ -0,0 +1,38 @@
+import pytest
+from blog.models import Category, Post
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_visibility_follows_category(mixer: Mixer, user: Model):
+    category = mixer.blend(Category, is_published=True)
+    posts = mixer.cycle(3).blend(Post, author=user, category=category)
+    hidden = mixer.blend(
+        Post, author=user, category=category, is_published=False
+    )
+    assert all(post.is_visible for post in posts)
+    assert not hidden.is_visible
+
+    category.is_published = False
+    category.save()
+    assert not Post.objects.filter(is_visible=True).exists(), (
+        "Убедитесь, что при снятии категории с публикации её посты"
+        " перестают отображаться в лентах."
+    )
+
+    category.is_published = True
+    category.save()
+    assert set(
+        Post.objects.filter(is_visible=True).values_list('pk', flat=True)
+    ) == {post.pk for post in posts}
+
+
+def test_published_manager_skips_category_join(mixer: Mixer, user: Model):
+    mixer.blend(Post, author=user)
+    with CaptureQueriesContext(connection) as queries:
+        list(Post.published.all())
+    assert 'blog_category' not in queries[0]['sql']
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+import pytest
+from blog.caching import get_feed_generations
+from blog.models import Post
+from blog.publication import publication_epoch, publish_due_posts
+from django.core.management import CommandError, call_command
+from django.db.models import Model
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_publication_epoch_is_coarse():
+    now = timezone.now()
+    epoch = publication_epoch(now)
+    assert epoch <= now
+    assert publication_epoch(epoch + timedelta(seconds=1)) == epoch
+
+
+def test_due_posts_bump_feeds(mixer: Mixer, user: Model):
+    epoch = publication_epoch()
+    post = mixer.blend(
+        Post, author=user, pub_date=epoch - timedelta(seconds=1)
+    )
+    mixer.blend(Post, author=user, pub_date=epoch + timedelta(days=1))
+    feed = f'category:{post.category_id}'
+    generation_before = get_feed_generations(feed)
+    urls = publish_due_posts(epoch - timedelta(minutes=1), epoch)
+    assert get_feed_generations(feed) != generation_before, (
+        "Убедитесь, что выпуск отложенного поста инвалидирует его ленты."
+    )
+    assert urls == sorted({
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{user.username}/',
+    })
+    assert list(Post.published.all()) == [post]
+
+
+def test_scheduler_refuses_local_cache():
+    with pytest.raises(CommandError):
+        call_command('publish_scheduled', once=True)
+
+
+def test_scheduler_runs_on_shared_cache(shared_cache):
+    call_command('publish_scheduled', once=True, no_warm=True)
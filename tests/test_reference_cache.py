@@ -0,0 +1,44 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(mixer: Mixer, user: Model):
+    return mixer.blend(
+        'blog.Post',
+        author=user,
+        category__is_published=True,
+        location__is_published=True,
+    )
+
+
+def test_feeds_skip_reference_joins(post, client):
+    client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f'/category/{post.category.slug}/')
+    content = response.content.decode()
+    assert post.category.title in content
+    assert post.location.name in content
+    assert not any(
+        'blog_category' in query['sql'] or 'blog_location' in query['sql']
+        for query in queries
+    ), (
+        "Убедитесь, что категории и локации берутся из кеша справочников,"
+        " а не из БД."
+    )
+
+
+def test_reference_change_is_visible(post, client):
+    client.get('/')
+    post.category.title = 'Переименованная категория'
+    post.category.save()
+    post.location.is_published = False
+    post.location.save()
+    content = client.get('/').content.decode()
+    assert 'Переименованная категория' in content
+    assert post.location.name not in content
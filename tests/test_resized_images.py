@@ -0,0 +1,111 @@
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db.models import Model
+from django.test import override_settings
+from mixer.backend.django import Mixer
+from PIL import Image
+
+from blog import images
+from blog.images import evict_shard
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def media(tmp_path, mixer: Mixer, user: Model):
+    media_root = tmp_path / 'media'
+    (media_root / 'posts_images').mkdir(parents=True)
+    Image.new('RGB', (2000, 1000), 'red').save(
+        media_root / 'posts_images' / 'big.jpg'
+    )
+    (tmp_path / 'secret.jpg').write_bytes(b'secret')
+    post = mixer.blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category__is_published=True,
+    )
+    Post.objects.filter(pk=post.pk).update(image='posts_images/big.jpg')
+    with override_settings(
+        MEDIA_ROOT=media_root, RESIZE_CACHE_ROOT=tmp_path / 'cache'
+    ):
+        yield tmp_path
+
+
+def test_resized_image(media, client):
+    url = '/media/r/640x480/posts_images/big.jpg'
+    response = client.get(url)
+    assert response.status_code == 200
+    image = Image.open(io.BytesIO(b''.join(response.streaming_content)))
+    assert image.size == (640, 320), (
+        "Убедитесь, что изображение уменьшается с сохранением пропорций."
+    )
+    assert 'max-age' in response['Cache-Control']
+    assert len(list((media / 'cache').rglob('*.jpg'))) == 1
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == 304, (
+        "Убедитесь, что повторный запрос с If-None-Match получает 304."
+    )
+
+
+@pytest.mark.parametrize('url', [
+    '/media/r/641x480/posts_images/big.jpg',
+    '/media/r/640x480/posts_images/missing.jpg',
+    '/media/r/640x480/../secret.jpg',
+    '/media/r/640x480/posts_images/%2e%2e/%2e%2e/secret.jpg',
+])
+def test_resized_image_rejects(media, client, url):
+    assert client.get(url).status_code == 404
+
+
+def test_private_resized_image_is_not_public(
+    media, mixer: Mixer, user: Model, user_client
+):
+    post = mixer.blend('blog.Post', author=user, is_published=False)
+    Post.objects.filter(pk=post.pk).update(image='posts_images/draft.jpg')
+    Image.new('RGB', (800, 600), 'blue').save(
+        media / 'media' / 'posts_images' / 'draft.jpg'
+    )
+    url = '/media/r/640x480/posts_images/draft.jpg'
+    response = user_client.get(url)
+    assert response.status_code == 200
+    assert 'private' in response['Cache-Control'], (
+        "Убедитесь, что копии изображений неопубликованных постов"
+        " не кешируются общими кешами."
+    )
+    assert 'public' not in response['Cache-Control']
+
+
+def test_unknown_size_is_not_modified_bypass(media, client):
+    response = client.get(
+        '/media/r/641x480/posts_images/big.jpg',
+        HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT',
+    )
+    assert response.status_code == 404, (
+        "Убедитесь, что неразрешённый размер не получает 304."
+    )
+
+
+def test_decompression_bomb_is_not_found(media, client, monkeypatch):
+    pool = ThreadPoolExecutor(1)
+    monkeypatch.setattr(images, '_get_pool', lambda: pool)
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 1000)
+    response = client.get('/media/r/640x480/posts_images/big.jpg')
+    pool.shutdown()
+    assert response.status_code == 404
+
+
+def test_evict_shard_removes_least_recently_used(tmp_path):
+    for index in range(4):
+        path = tmp_path / f'{index}.jpg'
+        path.write_bytes(b'x' * 100)
+        os.utime(path, (index, index))
+    assert evict_shard(tmp_path, max_bytes=250) == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        '2.jpg', '3.jpg'
+    ]
@@ -0,0 +1,85 @@
+from datetime import timedelta
+from io import StringIO
+from secrets import token_hex
+
+import pytest
+from blog.sessions import SessionStore
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Model
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+N_REQUESTS = 30
+
+
+def test_sweep_removes_only_expired_sessions():
+    now = timezone.now()
+    for i in range(5):
+        Session.objects.create(
+            session_key=f'expired{i}', session_data='',
+            expire_date=now - timedelta(days=1)
+        )
+    Session.objects.create(
+        session_key='alive', session_data='',
+        expire_date=now + timedelta(days=1)
+    )
+    call_command(
+        'sweep_sessions', batch_size=2, pause=0, stdout=StringIO()
+    )
+    assert list(
+        Session.objects.values_list('session_key', flat=True)
+    ) == ['alive']
+
+
+def _signed_session_request(payload, cookie=None):
+    def view(request):
+        request.session['payload'] = payload
+        return HttpResponse()
+
+    request = RequestFactory().get('/')
+    if cookie is not None:
+        request.COOKIES[settings.SESSION_COOKIE_NAME] = cookie
+    with override_settings(SESSION_ENGINE='blog.sessions'):
+        response = SessionMiddleware(view)(request)
+    assert response.status_code == 200
+    return response.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+def test_oversized_signed_session_is_not_written(caplog):
+    oversized = token_hex(settings.SESSION_COOKIE_MAX_SIZE)
+    cookie = _signed_session_request(oversized)
+    assert SessionStore(cookie).load() == {}, (
+        "Убедитесь, что переполненная сессия не записывается в cookie."
+    )
+    previous = _signed_session_request('small')
+    assert _signed_session_request(oversized, previous) == previous, (
+        "Убедитесь, что при переполнении клиент сохраняет прежнюю cookie."
+    )
+    assert 'SESSION_COOKIE_MAX_SIZE' in caplog.text
+
+
+def test_session_queries_per_engine(user: Model):
+    results = {}
+    for name, engine in settings.SESSION_ENGINES.items():
+        with override_settings(SESSION_ENGINE=engine):
+            client = Client()
+            client.force_login(user)
+            client.get('/')
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(N_REQUESTS):
+                    client.get('/')
+        session_queries = sum(
+            'django_session' in query['sql'] for query in queries
+        )
+        results[name] = session_queries
+    assert results['db'] >= N_REQUESTS
+    assert results['cached_db'] == 0
+    assert results['signed_cookies'] == 0
@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blogicum import settings as shipped_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def shipped_cache(local_cache):
+    with override_settings(CACHES=shipped_settings.CACHES):
+        from django.core.cache import cache
+
+        cache.clear()
+        yield
+
+
+@pytest.fixture
+def post(mixer: Mixer, user: Model):
+    return mixer.blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category__is_published=True,
+        location__is_published=True,
+    )
+
+
+def _steady_queries(client, url):
+    for _ in range(2):
+        assert client.get(url).status_code == 200
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == 200
+    return [query['sql'] for query in queries]
+
+
+@pytest.mark.parametrize('url, client_name, max_queries', [
+    ('/', 'client', 2),
+    ('/posts/{post.id}/', 'client', 2),
+    ('/posts/{post.id}/', 'user_client', 4),
+])
+def test_shipped_cache_steady_state(
+    post, request, url, client_name, max_queries
+):
+    queries = _steady_queries(
+        request.getfixturevalue(client_name), url.format(post=post)
+    )
+    assert not any('cache' in sql for sql in queries), (
+        "Убедитесь, что кеш по умолчанию не обращается к БД."
+    )
+    assert len(queries) <= max_queries, (
+        "Убедитесь, что с настройками кеша по умолчанию число запросов"
+        " к БД не растёт."
+    )
@@ -0,0 +1,52 @@
+import gzip
+
+import pytest
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(scope='module')
+def static_root(tmp_path_factory):
+    root = tmp_path_factory.mktemp('static_root')
+    with override_settings(STATIC_ROOT=root):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        yield root
+
+
+def test_collectstatic_writes_hashed_and_compressed_files(static_root):
+    url = static('css/bootstrap.min.css')
+    assert url != '/static/css/bootstrap.min.css', (
+        "Убедитесь, что статические файлы получают хеш содержимого в имени."
+    )
+    path = static_root / url[len('/static/'):]
+    assert path.is_file()
+    compressed = path.with_name(path.name + '.gz')
+    assert gzip.decompress(compressed.read_bytes()) == path.read_bytes()
+
+
+def test_static_serving(static_root, client):
+    url = static('css/bootstrap.min.css')
+    response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+    assert response.status_code == 200
+    assert response['Content-Encoding'] == 'gzip'
+    assert response['Content-Type'].startswith('text/css')
+    assert 'immutable' in response['Cache-Control']
+    assert 'Accept-Encoding' in response['Vary']
+    body = gzip.decompress(b''.join(response.streaming_content))
+    assert body == (static_root / url[len('/static/'):]).read_bytes()
+
+    response = client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0')
+    assert not response.has_header('Content-Encoding'), (
+        "Убедитесь, что сжатая копия не отдаётся без поддержки клиентом."
+    )
+    response = client.get('/static/css/bootstrap.min.css')
+    assert 'immutable' not in response['Cache-Control']
+
+
+def test_pages_link_hashed_assets(static_root, client):
+    content = client.get('/').content.decode()
+    assert static('img/logo.png') in content
+    assert '/static/img/logo.png' not in content
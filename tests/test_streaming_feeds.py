@@ -0,0 +1,63 @@
+import re
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Model
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = 5
+
+
+def normalize(html):
+    return re.sub(r'\s+', ' ', html)
+
+
+@pytest.fixture
+def posts(mixer: Mixer, user: Model):
+    return mixer.cycle(N_POSTS).blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category__is_published=True,
+    )
+
+
+@pytest.mark.parametrize('url', ['/', 'profile'])
+def test_feed_is_streamed(posts, user, client, url):
+    if url == 'profile':
+        url = f'/profile/{user.username}/'
+    with override_settings(STREAMING_FEEDS=True):
+        response = client.get(url)
+        assert response.streaming
+        with CaptureQueriesContext(connection) as queries:
+            chunks = [chunk.decode() for chunk in response.streaming_content]
+    assert '</head>' in chunks[0] and 'navbar' in chunks[0], (
+        "Убедитесь, что начало страницы отдаётся первой частью."
+    )
+    assert 'card-title' not in chunks[0]
+    assert len(chunks) == N_POSTS + 2, (
+        "Убедитесь, что карточки постов отдаются по одной."
+    )
+    assert any('"blog_post"' in query['sql'] for query in queries), (
+        "Убедитесь, что посты загружаются во время отдачи потока."
+    )
+    cache.clear()
+    plain = client.get(url).content.decode()
+    assert normalize(''.join(chunks)) == normalize(plain)
+
+
+def test_streamed_feed_fills_fragment_cache(posts, client):
+    with override_settings(STREAMING_FEEDS=True):
+        b''.join(client.get('/').streaming_content)
+        response = client.get('/')
+        with CaptureQueriesContext(connection) as queries:
+            chunks = list(response.streaming_content)
+    assert len(chunks) == 3, (
+        "Убедитесь, что закешированный фрагмент ленты отдаётся целиком."
+    )
+    assert not queries
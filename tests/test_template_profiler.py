@@ -0,0 +1,89 @@
+import logging
+
+import pytest
+from django.db.models import Model
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(mixer: Mixer, user: Model):
+    return mixer.cycle(5).blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category__is_published=True,
+    )
+
+
+@pytest.fixture
+def staff_client(user_client, user):
+    user.is_staff = True
+    user.save()
+    return user_client
+
+
+def test_profile_is_logged_for_staff(posts, staff_client, caplog):
+    with caplog.at_level(logging.INFO, logger='blog.profiling'):
+        response = staff_client.get('/?profile_templates=1')
+    assert 'templates;dur=' in response['Server-Timing'], (
+        'Убедитесь, что время отрисовки шаблонов передаётся '
+        'в заголовке Server-Timing.'
+    )
+    report = '\n'.join(
+        record.getMessage() for record in caplog.records
+        if record.name == 'blog.profiling'
+    )
+    for frame in (
+        'blog/post_list.html',
+        'base.html',
+        'includes/post_card.html',
+        '{% block content %}',
+        '{% for %}',
+    ):
+        assert frame in report, (
+            f'Убедитесь, что в отчёте профилировщика есть `{frame}`.'
+        )
+    assert '    5 x includes/post_card.html' in report
+
+
+def test_flame_dump_by_header(posts, staff_client):
+    response = staff_client.get('/', HTTP_X_PROFILE_TEMPLATES='flame')
+    assert response['Content-Type'].startswith('text/plain')
+    lines = response.content.decode().splitlines()
+    assert lines
+    for line in lines:
+        stack, _, micros = line.rpartition(' ')
+        assert stack and micros.isdigit()
+    assert any(
+        line.startswith('blog/post_list.html;{% extends %};base.html;')
+        and 'includes/post_card.html' in line
+        for line in lines
+    ), 'Убедитесь, что стеки содержат вложенные шаблоны.'
+
+
+def test_profiler_requires_staff(posts, user_client, client, caplog):
+    with caplog.at_level(logging.INFO, logger='blog.profiling'):
+        for some_client in (user_client, client):
+            response = some_client.get(
+                '/?profile_templates=flame',
+                HTTP_X_PROFILE_TEMPLATES='flame',
+            )
+            assert response['Content-Type'].startswith('text/html')
+            assert not response.has_header('Server-Timing')
+    assert not [
+        record for record in caplog.records
+        if record.name == 'blog.profiling'
+    ], (
+        'Убедитесь, что профилировщик доступен только персоналу.'
+    )
+
+
+def test_profiler_disabled_by_setting(posts, staff_client, settings):
+    settings.TEMPLATE_PROFILING = False
+    response = staff_client.get('/?profile_templates=flame')
+    assert response['Content-Type'].startswith('text/html')
+    assert not response.has_header('Server-Timing'), (
+        'Убедитесь, что без TEMPLATE_PROFILING профилировщик выключен.'
+    )
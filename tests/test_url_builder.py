@@ -0,0 +1,35 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+from blog.urlbuilder import build_url
+
+ROUTES = (
+    ('blog:index', ()),
+    ('blog:post_detail', (42,)),
+    ('blog:profile', ('user.name+test@x',)),
+    ('blog:category_posts', ('some-slug',)),
+    ('blog:edit_comment', (42, 7)),
+)
+
+
+def test_build_url_matches_reverse():
+    for name, args in ROUTES:
+        assert build_url(name, *args) == reverse(name, args=args), (
+            f"Убедитесь, что адрес `{name}` совпадает с результатом reverse."
+        )
+
+
+@pytest.mark.django_db
+def test_post_absolute_url_skips_author_query(mixer: Mixer, user: Model):
+    post_id = mixer.blend('blog.Post', author=user).pk
+    post = Post.objects.get(pk=post_id)
+    with CaptureQueriesContext(connection) as queries:
+        url = post.get_absolute_url()
+    assert url == f'/posts/{post_id}/'
+    assert not queries
+
@@ -0,0 +1,35 @@
+import pytest
+from blog import counters
+from blog.models import Post
+from django.db import connection
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+N_VIEWS = 50
+
+
+def test_read_path_is_write_free(mixer: Mixer, user: Model, client):
+    post = mixer.blend(Post, author=user, category__is_published=True)
+    url = f'/posts/{post.id}/'
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(N_VIEWS):
+            response = client.get(url)
+    writes = [
+        query['sql'] for query in queries
+        if query['sql'].lstrip().upper().startswith(('UPDATE', 'INSERT'))
+    ]
+    assert not writes, (
+        "Убедитесь, что просмотр поста не выполняет запись в БД."
+    )
+    assert f'Просмотров: {N_VIEWS}' in response.content.decode()
+
+    with CaptureQueriesContext(connection) as queries:
+        assert counters.flush_view_counts() == N_VIEWS
+    assert sum(
+        query['sql'].startswith('UPDATE') for query in queries
+    ) == 1, "Убедитесь, что буфер просмотров записывается одним запросом."
+    post.refresh_from_db()
+    assert post.view_count == N_VIEWS
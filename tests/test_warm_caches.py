@@ -0,0 +1,44 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Model
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.warmup import collect_warmup_urls
+
+
+@pytest.fixture
+def posts(mixer: Mixer, user: Model):
+    return mixer.cycle(3).blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category__is_published=True,
+    )
+
+
+@pytest.mark.django_db
+def test_collect_warmup_urls(posts, user):
+    urls = collect_warmup_urls(pages=5)
+    assert urls[0] == '/'
+    assert '/?page=2' not in urls, (
+        "Убедитесь, что прогреваются только существующие страницы ленты."
+    )
+    for post in posts:
+        assert f'/category/{post.category.slug}/' in urls
+        assert f'/posts/{post.id}/' in urls
+    assert f'/profile/{user.username}/' in urls
+
+
+@pytest.mark.django_db(transaction=True)
+def test_warm_caches_command(posts, capsys):
+    call_command('warm_caches', workers=4)
+    output = capsys.readouterr().out
+    assert '200 /\n' in output
+    with CaptureQueriesContext(connection) as queries:
+        Client().get('/')
+    assert not any('"blog_post"' in query['sql'] for query in queries), (
+        "Убедитесь, что после прогрева главная страница отдаётся из кеша."
+    )